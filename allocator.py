@@ -0,0 +1,182 @@
+from array import array # Для компактного хранения замеров занятости памяти
+import numpy as np
+
+
+# Распределитель памяти задач. Свободная память хранится интервалами [начало, начало + длина) бит,
+# сгруппированными по классам размера: класс k - интервалы длиной от 2^k до 2^(k+1) - 1 бит.
+# Непустые классы отмечены битами маски, поэтому задача размера size размещается без перебора
+# всей памяти: подходит любой интервал класса ceil(log2(size)) и выше, и только если таких нет,
+# просматривается класс floor(log2(size)). Задача занимает начало найденного интервала.
+# При освобождении соседние свободные интервалы сливаются за O(1) по словарям начал и концов.
+# Занятость памяти и фрагментация замеряются на тактах first_cycle + k * sample_interval (см. sample)
+class MemoryAllocator:
+    def __init__(self, capacity, sample_interval=1000):
+        self.capacity = capacity # Объем памяти в битах
+        self.sample_interval = sample_interval
+        self.free_by_start = {} # Начало свободного интервала -> длина
+        self.free_by_end = {} # Конец свободного интервала -> начало
+        self.classes = [{} for _ in range(max(capacity, 1).bit_length())] # Класс размера -> {начало: длина}
+        self.class_mask = 0 # Бит k установлен, если класс k не пуст
+        self.blocks = {} # Задача -> (начало, размер) занятого интервала
+        self.used = 0 # Занято бит
+        self.peak_used = 0 # Наибольшая занятость
+        self.admission_stalls = 0 # Тактов, в которые поступление задач откладывалось из-за нехватки памяти
+        self.last_stall = None # Последний такт с отказом в размещении
+        self.next_sample = 0 # Такт следующего замера
+        self.sample_cycles = array('q') # Замеры: такт, занято бит, фрагментация
+        self.sample_used = array('q')
+        self.sample_fragmentation = array('d')
+        if capacity:
+            self.insert_free(0, capacity)
+
+    def insert_free(self, start, length):
+        self.free_by_start[start] = length
+        self.free_by_end[start + length] = start
+        size_class = length.bit_length() - 1
+        self.classes[size_class][start] = length
+        self.class_mask |= 1 << size_class
+
+    def remove_free(self, start):
+        length = self.free_by_start.pop(start)
+        del self.free_by_end[start + length]
+        size_class = length.bit_length() - 1
+        del self.classes[size_class][start]
+        if not self.classes[size_class]:
+            self.class_mask &= ~(1 << size_class)
+        return length
+
+    # Размещает задачу task размера size бит; возвращает False, если подходящего интервала нет
+    def allocate(self, task, size):
+        start = self.find_free(size)
+        if start is None:
+            return False
+        length = self.remove_free(start)
+        if length > size:
+            self.insert_free(start + size, length - size)
+        self.blocks[task] = (start, size)
+        self.used += size
+        if self.used > self.peak_used:
+            self.peak_used = self.used
+        return True
+
+    # Начало свободного интервала длиной не меньше size или None
+    def find_free(self, size):
+        if size <= 0:
+            size = 1
+        fitting = self.class_mask >> (size - 1).bit_length()
+        if fitting:
+            # Наименьший непустой класс, все интервалы которого вмещают задачу
+            size_class = (size - 1).bit_length() + (fitting & -fitting).bit_length() - 1
+            return next(iter(self.classes[size_class]))
+        size_class = size.bit_length() - 1
+        if size_class < len(self.classes):
+            for start, length in self.classes[size_class].items():
+                if length >= size:
+                    return start
+        return None
+
+    # Отмечает отказ в размещении на такте cycle_time (повторные отказы в том же такте не считаются)
+    def stall(self, cycle_time):
+        if cycle_time != self.last_stall:
+            self.admission_stalls += 1
+            self.last_stall = cycle_time
+
+    # Освобождает память задачи task, сливая интервал с соседними свободными
+    def free(self, task):
+        start, size = self.blocks.pop(task)
+        self.used -= size
+        end = start + size
+        if end in self.free_by_start:
+            size += self.remove_free(end)
+        left = self.free_by_end.get(start)
+        if left is not None:
+            size += self.remove_free(left)
+            start = left
+        self.insert_free(start, size)
+
+    # Длина наибольшего свободного интервала
+    def largest_free(self):
+        if not self.class_mask:
+            return 0
+        return max(self.classes[self.class_mask.bit_length() - 1].values())
+
+    # Внешняя фрагментация: доля свободной памяти вне наибольшего свободного интервала
+    def fragmentation(self):
+        free = self.capacity - self.used
+        return 1 - self.largest_free() / free if free else 0.0
+
+    # Начинает замеры с такта first_cycle
+    def start_sampling(self, first_cycle):
+        self.next_sample = first_cycle
+
+    # Вызывается в начале такта cycle_time: занятость с конца предыдущего обработанного такта не менялась,
+    # поэтому она записывается для всех тактов замеров до cycle_time. Замеры не зависят от того,
+    # обходятся такты подряд или с пропуском тактов простоя
+    def sample(self, cycle_time):
+        if cycle_time <= self.next_sample:
+            return
+        fragmentation = self.fragmentation()
+        while self.next_sample < cycle_time:
+            self.sample_cycles.append(self.next_sample)
+            self.sample_used.append(self.used)
+            self.sample_fragmentation.append(fragmentation)
+            self.next_sample += self.sample_interval
+
+    # Итоги: объем, наибольшая и текущая занятость, фрагментация, отказы в размещении
+    # и замеры занятости во времени (массивы NumPy)
+    def report(self):
+        fragmentation = np.frombuffer(self.sample_fragmentation, dtype=np.float64).copy()
+        return {
+            'capacity': self.capacity,
+            'peak_used': self.peak_used,
+            'peak_utilization': self.peak_used / self.capacity if self.capacity else 0.0,
+            'used': self.used,
+            'free_intervals': len(self.free_by_start),
+            'largest_free': self.largest_free(),
+            'fragmentation': self.fragmentation(),
+            'max_fragmentation': float(fragmentation.max()) if len(fragmentation) else 0.0,
+            'admission_stalls': self.admission_stalls,
+            'sample_cycles': np.frombuffer(self.sample_cycles, dtype=np.int64).copy(),
+            'sample_used': np.frombuffer(self.sample_used, dtype=np.int64).copy(),
+            'sample_fragmentation': fragmentation,
+        }
+
+    # Состояние для контрольной точки; занятые интервалы - по индексам задач в таблице.
+    # Свободные интервалы сохраняются по классам в порядке добавления: от него зависит выбор интервала
+    def checkpoint(self):
+        free = [(start, length) for size_class in self.classes for start, length in size_class.items()]
+        return {
+            'free_starts': np.array([start for start, _ in free], dtype=np.int64),
+            'free_lengths': np.array([length for _, length in free], dtype=np.int64),
+            'block_indices': np.array([task.index for task in self.blocks], dtype=np.int64),
+            'block_starts': np.array([start for start, _ in self.blocks.values()], dtype=np.int64),
+            'block_sizes': np.array([size for _, size in self.blocks.values()], dtype=np.int64),
+            'peak_used': self.peak_used,
+            'admission_stalls': self.admission_stalls,
+            'last_stall': self.last_stall,
+            'next_sample': self.next_sample,
+            'samples': (np.frombuffer(self.sample_cycles, dtype=np.int64).copy(),
+                        np.frombuffer(self.sample_used, dtype=np.int64).copy(),
+                        np.frombuffer(self.sample_fragmentation, dtype=np.float64).copy()),
+        }
+
+    # Восстанавливает состояние контрольной точки; table - таблица задач запуска
+    def resume(self, state, table):
+        self.free_by_start = {}
+        self.free_by_end = {}
+        self.classes = [{} for _ in self.classes]
+        self.class_mask = 0
+        for start, length in zip(state['free_starts'].tolist(), state['free_lengths'].tolist()):
+            self.insert_free(start, length)
+        self.blocks = {table.row(index): (start, size) for index, start, size in
+                       zip(state['block_indices'].tolist(), state['block_starts'].tolist(),
+                           state['block_sizes'].tolist())}
+        self.used = sum(size for _, size in self.blocks.values())
+        self.peak_used = state['peak_used']
+        self.admission_stalls = state['admission_stalls']
+        self.last_stall = state['last_stall']
+        self.next_sample = state['next_sample']
+        cycles, used, fragmentation = state['samples']
+        self.sample_cycles = array('q', cycles.tobytes())
+        self.sample_used = array('q', used.tobytes())
+        self.sample_fragmentation = array('d', fragmentation.tobytes())
@@ -0,0 +1,73 @@
+import numpy as np
+
+# Коды исходов выполнения кванта
+COMPLETED = 0
+EXPIRED = 1
+REQUEUED = 2
+
+
+# Пакетный исполнитель: хранит задачи в виде структуры массивов (struct of arrays)
+# и продвигает квант сразу для всех занятых ядер одной векторной операцией
+class BatchExecutor:
+    def __init__(self, table, order, cores_count):
+        self.table = table # Таблица задач; остаток операций, TTL и время начала обновляются прямо в ней
+        self.cores_count = cores_count # Общее количество ядер во всех процессорах
+        self.remaining = table.remaining_operations
+        self.ttl = table.ttl
+        self.start_time = table.start_time
+        # Очередь задач - кольцевой буфер индексов, каждая задача находится в очереди не более одного раза
+        self.queue = np.empty(max(len(table), 1), dtype=np.int64)
+        self.queue[:len(order)] = order
+        self.head = 0
+        self.queue_size = len(order)
+
+    def empty(self):
+        return self.queue_size == 0
+
+    # Индексы задач в очереди в порядке очереди
+    def queued_indices(self):
+        return self.queue[(self.head + np.arange(self.queue_size)) % len(self.queue)]
+
+    # Выполняет один такт: назначает задачи из очереди на ядра по порядку и продвигает квант.
+    # Возвращает индексы задач (позиция в массиве - номер ядра), коды исходов
+    # и остаток операций задач перед выполнением кванта
+    def step(self, cycle_time, time_quantum):
+        capacity = len(self.queue)
+        busy = min(self.cores_count, self.queue_size)
+        slots = (self.head + np.arange(busy)) % capacity
+        index = self.queue[slots]
+        self.head = (self.head + busy) % capacity
+        self.queue_size -= busy
+
+        start = self.start_time[index]
+        self.start_time[index] = np.where(start < 0, cycle_time, start)
+
+        remaining = self.remaining[index]
+        remaining_before = remaining
+        ttl = self.ttl[index]
+        if time_quantum > 0:
+            # Задачи, которые можно выполнять: остались операции и не истек TTL
+            runnable = (remaining > 0) & (ttl > 0)
+            # За одну операцию TTL уменьшается на 2 (см. task_table.quantum_outcome)
+            steps = np.minimum(np.minimum(remaining, (ttl + 1) // 2), time_quantum)
+            steps = np.where(runnable, steps, 0)
+            remaining = remaining - steps
+            ttl = ttl - 2 * steps
+            completed = remaining <= 0
+            expired = ~completed & (ttl <= 0)
+        else:
+            completed = np.zeros(busy, dtype=bool)
+            expired = np.zeros(busy, dtype=bool)
+        self.remaining[index] = remaining
+        self.ttl[index] = ttl
+
+        outcome = np.full(busy, REQUEUED, dtype=np.int8)
+        outcome[completed] = COMPLETED
+        outcome[expired] = EXPIRED
+
+        # Незавершенные задачи возвращаются в конец очереди в порядке ядер
+        requeued = index[outcome == REQUEUED]
+        tail = (self.head + self.queue_size + np.arange(len(requeued))) % capacity
+        self.queue[tail] = requeued
+        self.queue_size += len(requeued)
+        return index, outcome, remaining_before.tolist()
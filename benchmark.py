@@ -0,0 +1,163 @@
+import argparse # Для разбора аргументов командной строки
+import json
+import multiprocessing # Каждая нагрузка выполняется в новом процессе (отдельный пиковый RSS)
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from simulator import simulate, DEFAULT_CONFIG
+from diagrams import aggregate
+
+try:
+    import resource # Пиковый RSS процесса (нет в Windows)
+except ImportError:
+    resource = None
+
+BENCHMARK_SEED = 12345 # Зерно генерации задач всех нагрузок
+DEFAULT_SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+DEFAULT_MODES = ('event',)
+PROFILE_SAMPLE = 64 # Выборочные замеры фаз, чтобы профилирование почти не влияло на время
+TOLERANCE = 0.2 # Допустимое ухудшение времени и памяти относительно эталона (20%)
+REPEAT = 3 # Количество повторов нагрузки, в результат идет самый быстрый
+
+
+# Пиковый RSS текущего процесса в мегабайтах (None, если недоступен)
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # В macOS ru_maxrss в байтах, в Linux - в килобайтах
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+# Имя нагрузки в таблице результатов и в эталоне
+def workload_name(workload):
+    return f"{workload['mode']}-{workload['num_tasks']}"
+
+
+# Выполняет нагрузку repeat раз и возвращает самый быстрый повтор (меньше всего шума)
+def run_workload(workload, repeat=REPEAT):
+    rows = [run_once(workload) for _ in range(repeat)]
+    best = min(rows, key=lambda row: row['wall_time'])
+    best['peak_rss_mb'] = peak_rss_mb()
+    return best
+
+
+# Выполняет одну нагрузку: генерация задач, упаковка во фреймы, выполнение и сводные данные
+# для диаграмм. Возвращает время фаз (по замерам профилировщика), пропускную способность и пиковый RSS
+def run_once(workload):
+    config = dict(DEFAULT_CONFIG, **workload, seed=BENCHMARK_SEED, profile=True, profile_sample=PROFILE_SAMPLE)
+    started = time.perf_counter()
+    results = simulate(config)
+    aggregate_started = time.perf_counter()
+    aggregate(results)
+    finished = time.perf_counter()
+
+    timers = results.profile['timers']
+    counters = results.profile['counters']
+    execute_seconds = timers['simulate.execute']['estimated_seconds']
+    # Событие - один выполненный квант: завершение, истечение TTL или возврат в очередь
+    events = counters.get('tasks.completed', 0) + counters.get('tasks.expired', 0) + counters.get('tasks.requeued', 0)
+    return {
+        'name': workload_name(workload),
+        'mode': workload['mode'],
+        'num_tasks': workload['num_tasks'],
+        'wall_time': finished - started,
+        'generate_time': timers.get('memory.generate', {}).get('estimated_seconds', 0.0),
+        'frames_time': timers.get('channel.calculate_frames', {}).get('estimated_seconds', 0.0),
+        'execute_time': execute_seconds,
+        'aggregate_time': finished - aggregate_started,
+        'cycles': results.execution_cycles,
+        'events': events,
+        'cycles_per_second': results.execution_cycles / execute_seconds if execute_seconds else None,
+        'tasks_per_second': workload['num_tasks'] / execute_seconds if execute_seconds else None,
+        'events_per_second': events / execute_seconds if execute_seconds else None,
+        'completed_tasks': results.completed_tasks,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+# Запускает нагрузки по очереди, каждую в новом процессе: замеры не мешают друг другу,
+# а пиковый RSS относится к одной нагрузке
+def run_benchmarks(sizes=DEFAULT_SIZES, modes=DEFAULT_MODES, repeat=REPEAT, verbose=True):
+    context = multiprocessing.get_context('spawn')
+    rows = []
+    for mode in modes:
+        for num_tasks in sizes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                row = executor.submit(run_workload, {'mode': mode, 'num_tasks': num_tasks}, repeat).result()
+            rows.append(row)
+            if verbose:
+                print(f"{row['name']}: {row['wall_time']:.3f} s, {row['events_per_second']:.0f} events/s, "
+                      f"{row['tasks_per_second']:.0f} tasks/s, peak RSS {row['peak_rss_mb']} MB")
+    return rows
+
+
+# Сведения об окружении, в котором получены результаты
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def write_results(rows, path):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'environment': environment(), 'results': rows}, file, indent=2)
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as file:
+        return {row['name']: row for row in json.load(file)['results']}
+
+
+# Сравнивает результаты с эталоном: время выполнения и пиковый RSS не должны вырасти больше
+# чем на tolerance. Нагрузки, которых нет в эталоне, не сравниваются (о них выводится предупреждение).
+# Возвращает список строк с описанием ухудшений
+def compare(rows, baseline, tolerance=TOLERANCE):
+    regressions = []
+    for row in rows:
+        reference = baseline.get(row['name'])
+        if reference is None:
+            print(f"Warning: {row['name']} is not in the baseline and was not compared", file=sys.stderr)
+            continue
+        for metric in ('wall_time', 'execute_time', 'peak_rss_mb'):
+            if row[metric] is None or not reference.get(metric):
+                continue
+            ratio = row[metric] / reference[metric]
+            print(f"{row['name']} {metric}: {row[metric]:.3f} (baseline {reference[metric]:.3f}, x{ratio:.2f})")
+            if ratio > 1 + tolerance:
+                regressions.append(f"{row['name']} {metric} x{ratio:.2f}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Замеры производительности симуляции на нагрузках от 10^3 до 10^6 задач')
+    parser.add_argument('-s', '--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='Количества задач')
+    parser.add_argument('-m', '--modes', nargs='+', default=list(DEFAULT_MODES), help='Режимы симуляции')
+    parser.add_argument('-r', '--repeat', type=int, default=REPEAT, help='Количество повторов каждой нагрузки')
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help='JSON-файл результатов')
+    parser.add_argument('-b', '--baseline', default='benchmark_baseline.json', help='JSON-файл эталонных результатов')
+    parser.add_argument('--save-baseline', action='store_true', help='Сохранить результаты как эталон')
+    parser.add_argument('-t', '--tolerance', type=float, default=TOLERANCE, help='Допустимое ухудшение (доля)')
+    args = parser.parse_args()
+    if not args.save_baseline and not os.path.exists(args.baseline):
+        # Без эталона проверка регрессий невозможна; это ошибка, а не успешный запуск
+        print(f'Error: baseline {args.baseline} not found, regressions cannot be checked. Create it on the '
+              f'reference machine with --save-baseline.', file=sys.stderr)
+        sys.exit(2)
+    rows = run_benchmarks(args.sizes, args.modes, args.repeat)
+    write_results(rows, args.output)
+    if args.save_baseline:
+        write_results(rows, args.baseline)
+        print(f'Baseline written to {args.baseline}')
+    else:
+        regressions = compare(rows, load_results(args.baseline), args.tolerance)
+        if regressions:
+            print('Regressions: ' + ', '.join(regressions))
+            sys.exit(1)
+        print('No regressions.')
@@ -0,0 +1,70 @@
+import os
+import pickle # Двоичный формат контрольной точки (массивы NumPy сериализуются как есть)
+import threading # Для фоновой записи контрольных точек
+
+CHECKPOINT_VERSION = 6 # Версия формата состояния симуляции
+
+
+# Периодические контрольные точки симуляции. Состояние снимается в основном потоке
+# (копирование изменяемых столбцов таблицы задач и статистики), а сериализация и запись
+# на диск идут в фоновом потоке, поэтому выполнение останавливается только на время снимка.
+# Файл заменяется атомарно: при прерывании во время записи остается предыдущая контрольная точка.
+# Ошибка записи передается в основной поток при следующей контрольной точке; при закрытии
+# она не поднимается: на диске остается предыдущая контрольная точка
+class Checkpointer:
+    def __init__(self, path, interval=100000):
+        self.path = path # Файл контрольной точки
+        self.interval = interval # Период контрольных точек в тактах
+        self.next_cycle = None # Такт следующей контрольной точки
+        self.thread = None # Поток записи предыдущей контрольной точки
+        self.saved = 0 # Количество записанных контрольных точек
+        self.error = None # Исключение потока записи
+
+    # Пора ли записывать контрольную точку на такте cycle_time
+    def due(self, cycle_time):
+        if self.next_cycle is None:
+            self.next_cycle = cycle_time + self.interval
+        return cycle_time >= self.next_cycle
+
+    # Снимает состояние симуляции (queued_indices - очередь пакетного исполнителя) и запускает запись
+    def save(self, simulation, queued_indices=None):
+        state = simulation.checkpoint_state(queued_indices)
+        self.wait()
+        self.thread = threading.Thread(target=self.write, args=(state,), name='Checkpointer')
+        self.thread.start()
+        self.next_cycle = simulation.cycle_time + self.interval
+
+    def write(self, state):
+        part_path = self.path + '.part'
+        try:
+            with open(part_path, 'wb') as file:
+                pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(part_path, self.path)
+            self.saved += 1
+        except BaseException as error:
+            self.error = error
+
+    # Дожидается окончания записи предыдущей контрольной точки
+    def wait(self):
+        self.join()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def join(self):
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def close(self):
+        self.join()
+
+
+def load_checkpoint(path):
+    with open(path, 'rb') as file:
+        state = pickle.load(file)
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f'Unsupported checkpoint version {state.get("version")!r} in {path}')
+    return state
@@ -1,113 +1,155 @@
-import matplotlib
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
+import os
 import numpy as np
+from matplotlib.figure import Figure # Фигуры без pyplot не зависят от графического интерфейса
 
+FRAME_BARS_LIMIT = 1000 # Количество фреймов, после которого загруженность рисуется линией, а не столбцами
 
-def plot_task_counts(processors):
-    task_counts = []
-    processors_names = []
-    for processor in processors:
-        task_counts.append(processor.completed_tasks)
-        processors_names.append(processor.name)
-    plt.figure(figsize=(10, 6))
-    plt.bar(processors_names, task_counts, color='skyblue')
-    plt.xlabel('Процессор')
-    plt.ylabel('Количество задач')
-    plt.title('Гистограмма количества задач, выполненных процессорами')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.show()
 
+# Сводные данные для диаграмм из итогов запуска: счетчики процессоров и ядер
+# переводятся в массивы (процессоры x типы, ядра x типы) без обхода списков задач,
+# загруженность фреймов - в один массив
+def aggregate(results):
+    processors = results.processors
+    task_types = list(results.round_robin.memory.task_types)
+    type_codes = {task_type: code for code, task_type in enumerate(task_types)}
+
+    def type_counts(counters):
+        counts = np.zeros(len(task_types), dtype=np.int64)
+        for task_type, count in counters.items():
+            counts[type_codes[task_type]] = count
+        return counts
+
+    return {
+        'task_types': task_types,
+        'processor_names': [processor.name for processor in processors],
+        'completed': np.array([processor.completed_tasks for processor in processors], dtype=np.int64),
+        'by_type': np.array([type_counts(processor.completed_by_type) for processor in processors]).reshape(-1, len(task_types)),
+        'core_names': [[core.name for core in processor.cores] for processor in processors],
+        'by_core': [np.array([type_counts(core.completed_by_type) for core in processor.cores]).reshape(-1, len(task_types))
+                    for processor in processors],
+        'frame_fill': np.fromiter((frame.frame_fill_percentage for frame in results.ethernet_frames), dtype=np.float64,
+                                  count=len(results.ethernet_frames)),
+    }
 
-def plot_task_type_counts(processors):
-    task_types = ['cycling', 'periodic', 'impulse']
-    processors_names = []
-    for processor in processors:
-        for task in processor.completed_tasks_for_diagram:
-            if task.task_type == 'Cycling':
-                processor.cycling_tasks.append(task)
-            elif task.task_type == 'Periodic':
-                processor.periodic_tasks.append(task)
-            elif task.task_type == 'Impulse':
-                processor.impulse_tasks.append(task)
-    task_counts = [[len(processor.cycling_tasks), len(processor.periodic_tasks), len(processor.impulse_tasks)] for processor in processors]
-    for processor in processors:
-        processors_names.append(processor.name)
-    x = np.arange(len(processors))  # Место для процессоров на оси X
-    width = 0.15  # Ширина каждого столбца на гистограмме
-    fig, ax = plt.subplots(figsize=(12, 8))
-    task_counts = np.array(task_counts)
+
+def plot_task_counts(aggregates, new_figure=Figure):
+    fig = new_figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    ax.bar(aggregates['processor_names'], aggregates['completed'], color='skyblue')
+    ax.set_xlabel('Процессор')
+    ax.set_ylabel('Количество задач')
+    ax.set_title('Гистограмма количества задач, выполненных процессорами')
+    ax.tick_params(axis='x', rotation=45)
+    fig.tight_layout()
+    return fig
+
+
+# Столбцы по типам задач для групп (процессоров или ядер) из матрицы группы x типы
+def grouped_bars(ax, names, counts, task_types, width):
+    x = np.arange(len(names))
     for i, task_type in enumerate(task_types):
-        ax.bar(x + i * width, task_counts[:, i], width, label=task_type)
+        ax.bar(x + i * width, counts[:, i], width, label=task_type)
+    ax.set_xticks(x + width * (len(task_types) - 1) / 2)
+    ax.set_xticklabels(names, rotation=45)
+
+
+def plot_task_type_counts(aggregates, new_figure=Figure):
+    fig = new_figure(figsize=(12, 8))
+    ax = fig.add_subplot()
+    grouped_bars(ax, aggregates['processor_names'], aggregates['by_type'], aggregates['task_types'], 0.15)
     ax.set_xlabel('Процессор')
     ax.set_ylabel('Количество задач')
     ax.set_title('Гистограмма количества задач каждого типа, выполненных каждым процессором')
-    ax.set_xticks(x + width * (len(task_types) - 1) / 2)
-    ax.set_xticklabels(processors_names, rotation=45)
     ax.legend(title='Типы задач', bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    return fig
 
 
-def plot_ethernet_frame_load(ethernet_frames):
-    load_percentages = []
-    for frame in ethernet_frames:
-        load_percentages.append(frame.frame_fill_percentage)
-    plt.figure(figsize=(10, 6))
-    indices = []
-    for i in range(len(ethernet_frames)):
-        indices.append(i)
-    plt.bar(indices, load_percentages, color='lightcoral')
-    plt.xlabel('Ethernet фрейм')
-    plt.ylabel('Загруженность (%)')
-    plt.title('Гистограмма загруженности Ethernet фреймов')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.show()
+def plot_ethernet_frame_load(aggregates, new_figure=Figure):
+    load_percentages = aggregates['frame_fill']
+    fig = new_figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    indices = np.arange(len(load_percentages))
+    if len(load_percentages) > FRAME_BARS_LIMIT:
+        ax.plot(indices, load_percentages, color='lightcoral', linewidth=0.5)
+    else:
+        ax.bar(indices, load_percentages, color='lightcoral')
+    ax.set_xlabel('Ethernet фрейм')
+    ax.set_ylabel('Загруженность (%)')
+    ax.set_title('Гистограмма загруженности Ethernet фреймов')
+    ax.tick_params(axis='x', rotation=45)
+    fig.tight_layout()
+    return fig
 
 
-def plot_task_distribution_by_cores(processors):
-    """
-    Построить гистограммы распределения задач по ядрам для каждого процессора.
+# Гистограммы распределения задач по ядрам, по одной на каждый процессор
+def plot_task_distribution_by_cores(aggregates, new_figure=Figure):
+    figures = []
+    for processor_name, core_names, core_task_counts in zip(aggregates['processor_names'], aggregates['core_names'],
+                                                            aggregates['by_core']):
+        fig = new_figure(figsize=(12, 6))
+        ax = fig.add_subplot()
+        grouped_bars(ax, core_names, core_task_counts, aggregates['task_types'], 0.2)
+        ax.set_xlabel('Ядра')
+        ax.set_ylabel('Количество задач')
+        ax.set_title(f'Распределение задач по ядрам процессора {processor_name}')
+        ax.legend(title='Типы задач')
+        fig.tight_layout()
+        figures.append(fig)
+    return figures
 
-    :param processors: Список процессоров. У каждого процессора есть ядра и выполненные задачи.
-    """
-    task_types = ['Cycling', 'Periodic', 'Impulse']
 
-    for processor in processors:
-        # Собираем данные для каждого ядра
-        core_names = [core.name for core in processor.cores]
-        core_task_counts = []  # Массив количества задач для каждого ядра
-        cycling_count = 0
-        impulse_count = 0
-        periodic_count = 0
-        for core in processor.cores:
-            for task in core.completed_task_for_diagram:
-                if task.task_type == 'Cycling':
-                    cycling_count += 1
-                if task.task_type == 'Periodic':
-                    periodic_count += 1
-                if task.task_type == 'Impulse':
-                    impulse_count += 1
+# Занятость памяти во времени по замерам модели памяти (см. MemoryAllocator.report)
+def plot_memory_occupancy(memory, new_figure=Figure):
+    fig = new_figure(figsize=(12, 6))
+    ax = fig.add_subplot()
+    ax.plot(memory['sample_cycles'], memory['sample_used'] / memory['capacity'] * 100, color='seagreen', linewidth=0.8,
+            label='Занятость')
+    ax.plot(memory['sample_cycles'], memory['sample_fragmentation'] * 100, color='darkorange', linewidth=0.8,
+            label='Фрагментация')
+    ax.axhline(memory['peak_utilization'] * 100, color='gray', linestyle='--', linewidth=0.8, label='Пиковая занятость')
+    ax.set_xlabel('Такт')
+    ax.set_ylabel('%')
+    ax.set_title('Занятость и фрагментация памяти во времени')
+    ax.legend()
+    fig.tight_layout()
+    return fig
 
-            core_task_counts.append([cycling_count, periodic_count, impulse_count])
 
-        core_task_counts = np.array(core_task_counts)  # Преобразуем в массив для удобства
+# Все диаграммы запуска в виде списка (имя, фигура). Диаграмма фреймов строится,
+# только если фреймы сохранены (в потоковом режиме они не хранятся), диаграмма памяти -
+# только при включенной модели памяти
+def build_figures(results, new_figure=Figure):
+    aggregates = aggregate(results)
+    figures = [('task_counts', plot_task_counts(aggregates, new_figure)),
+               ('task_type_counts', plot_task_type_counts(aggregates, new_figure))]
+    if len(aggregates['frame_fill']):
+        figures.append(('ethernet_frame_load', plot_ethernet_frame_load(aggregates, new_figure)))
+    for processor_name, fig in zip(aggregates['processor_names'], plot_task_distribution_by_cores(aggregates, new_figure)):
+        figures.append((f'cores_{processor_name}', fig))
+    if results.memory is not None:
+        figures.append(('memory_occupancy', plot_memory_occupancy(results.memory, new_figure)))
+    return figures
 
-        # Построение гистограммы для данного процессора
-        x = np.arange(len(core_names))  # Индексы для ядер
-        width = 0.2  # Ширина столбцов
 
-        fig, ax = plt.subplots(figsize=(12, 6))
-        for i, task_type in enumerate(task_types):
-            ax.bar(x + i * width, core_task_counts[:, i], width, label=task_type)
+# Сохраняет все диаграммы без графического интерфейса: в один многостраничный PDF,
+# если path оканчивается на .pdf, иначе - в каталог path по одному PNG на диаграмму
+def save_report(results, path):
+    figures = build_figures(results)
+    if path.endswith('.pdf'):
+        from matplotlib.backends.backend_pdf import PdfPages
+        with PdfPages(path) as pdf:
+            for _, fig in figures:
+                pdf.savefig(fig)
+    else:
+        os.makedirs(path, exist_ok=True)
+        for name, fig in figures:
+            fig.savefig(os.path.join(path, f'{name}.png'))
+    return [name for name, _ in figures]
 
-        ax.set_xlabel('Ядра')
-        ax.set_ylabel('Количество задач')
-        ax.set_title(f'Распределение задач по ядрам процессора {processor.name}')
-        ax.set_xticks(x + width * (len(task_types) - 1) / 2)
-        ax.set_xticklabels(core_names, rotation=45)
-        ax.legend(title='Типы задач')
-        plt.tight_layout()
-        plt.show()
+
+# Показывает все диаграммы в окнах одновременно (требуется графический интерфейс)
+def show_diagrams(results):
+    import matplotlib.pyplot as plt
+    build_figures(results, plt.figure)
+    plt.show()
@@ -0,0 +1,23 @@
+import heapq # Для выбора свободного ядра с наименьшим номером
+
+
+# Индекс свободных ядер: куча порядковых номеров ядер (в порядке процессоров и ядер).
+# Выдает свободное ядро с наименьшим номером, поэтому порядок назначения задач
+# совпадает с обходом всех ядер подряд, но стоимость пропорциональна числу назначений
+class FreeCoreIndex:
+    def __init__(self, cores):
+        self.cores = cores # Все ядра системы в порядке процессоров и ядер
+        self.positions = {core: position for position, core in enumerate(cores)}
+        self.heap = [position for position, core in enumerate(cores) if core.status is None]
+        heapq.heapify(self.heap)
+
+    def __len__(self):
+        return len(self.heap)
+
+    # Извлекает свободное ядро с наименьшим номером
+    def pop(self):
+        return self.cores[heapq.heappop(self.heap)]
+
+    # Возвращает освободившееся ядро в индекс
+    def release(self, core):
+        heapq.heappush(self.heap, self.positions[core])
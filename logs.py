@@ -0,0 +1,152 @@
+import atexit # Для сброса буферов при завершении программы
+import os
+import threading # Для фоновой записи логов
+from profiler import NULL_PROFILER
+
+# Уровни логирования
+TRACE = 5 # Снимки состояния всех задач
+DEBUG = 10 # Логи процессоров (назначение и выполнение задач на ядрах)
+INFO = 20 # Системный лог (эхо-ответы о завершении, возврате в очередь и истечении TTL)
+WARNING = 30
+LEVELS = {'TRACE': TRACE, 'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING}
+
+
+# Буферизованная запись логов: строки копятся в памяти и сбрасываются в файлы
+# фоновым потоком крупными блоками, файлы открываются один раз.
+# profiler - замеры времени сброса и эхо-вывода (profiler.py)
+class LogWriter:
+    def __init__(self, level=INFO, echo=True, batch_size=10000, flush_interval=0.5, profiler=None):
+        self.level = level # Минимальный уровень записываемых сообщений
+        self.echo_enabled = echo # Выводить ли эхо-ответы на экран
+        self.batch_size = batch_size # Количество строк, после которого буфер сбрасывается сразу
+        self.flush_interval = flush_interval # Период фонового сброса в секундах
+        self.profiler = profiler or NULL_PROFILER
+        self.buffers = {} # Буферы строк по именам файлов
+        self.pending = 0 # Количество строк в буферах
+        self.files = {} # Открытые файлы логов
+        self.paths = set() # Все файлы логов, в которые шла запись (для контрольных точек)
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock() # Сохраняет порядок строк при одновременном сбросе
+        self.wakeup = threading.Event()
+        self.stopped = False
+        self.thread = threading.Thread(target=self.run, name='LogWriter', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def enabled_for(self, level):
+        return level >= self.level
+
+    # Создает (очищает) файл лога и записывает заголовок
+    def reset(self, path, header):
+        self.flush()
+        with self.write_lock:
+            if path in self.files:
+                self.files.pop(path).close()
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(header)
+            self.paths.add(path)
+
+    # Добавляет запись в буфер файла; форматирование строки выполняется при сбросе
+    def write(self, path, time_in_seconds, log, level=INFO):
+        if level < self.level:
+            return
+        with self.lock:
+            self.buffers.setdefault(path, []).append((time_in_seconds, log))
+            self.pending += 1
+            if self.pending >= self.batch_size:
+                self.wakeup.set()
+
+    # Выводит эхо-ответ на экран, если вывод не отключен
+    def echo(self, message):
+        if self.echo_enabled:
+            started = self.profiler.start('io.echo')
+            print(message)
+            self.profiler.stop('io.echo', started)
+
+    # Записывает накопленные строки во все файлы
+    def flush(self):
+        with self.write_lock:
+            with self.lock:
+                buffers, self.buffers = self.buffers, {}
+                self.pending = 0
+            if not buffers:
+                return
+            started = self.profiler.start('io.log_flush')
+            for path, records in buffers.items():
+                file = self.files.get(path)
+                if file is None:
+                    file = self.files[path] = open(path, "a", encoding="utf-8")
+                    self.paths.add(path)
+                file.write("".join([f"Time {time_in_seconds:.9f}s: {log}\n" for time_in_seconds, log in records]))
+                file.flush()
+                self.profiler.count('io.log_lines', len(records))
+            self.profiler.stop('io.log_flush', started)
+
+    # Сбрасывает буферы и возвращает размеры файлов логов для контрольной точки
+    def checkpoint(self):
+        self.flush()
+        with self.write_lock:
+            return {path: os.path.getsize(path) for path in self.paths if os.path.exists(path)}
+
+    # Продолжает запись с контрольной точки: строки, записанные после нее, удаляются из файлов
+    def resume(self, sizes):
+        self.flush()
+        with self.write_lock:
+            for path, size in sizes.items():
+                if path in self.files:
+                    self.files.pop(path).close()
+                with open(path, "r+b") as file:
+                    file.truncate(size)
+                self.paths.add(path)
+
+    def run(self):
+        while not self.stopped:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
+
+    # Останавливает фоновый поток, сбрасывает буферы и закрывает файлы
+    def close(self):
+        self.stopped = True
+        self.wakeup.set()
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.flush()
+        with self.write_lock:
+            for file in self.files.values():
+                file.close()
+            self.files = {}
+        atexit.unregister(self.close)
+
+
+# Запись логов без файлов и эхо-ответов: все сообщения отбрасываются, фоновый поток не создается.
+# Используется запуском, которому не передана запись логов
+class NullLogWriter:
+    echo_enabled = False
+
+    def enabled_for(self, level):
+        return False
+
+    def reset(self, path, header):
+        pass
+
+    def write(self, path, time_in_seconds, log, level=INFO):
+        pass
+
+    def echo(self, message):
+        pass
+
+    def flush(self):
+        pass
+
+    def checkpoint(self):
+        return {}
+
+    def resume(self, sizes):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_LOG_WRITER = NullLogWriter() # Общая пустая запись логов по умолчанию
@@ -0,0 +1,122 @@
+import heapq # Для выбора фрейма с наименьшим номером внутри группы
+import numpy as np
+
+EMPTY = float('inf') # Значение пустого листа дерева отрезков
+
+
+# Дерево отрезков минимумов над остаточной вместимостью фреймов.
+# Лист с номером c относится к фреймам, у которых свободно ровно c бит
+class CapacityTree:
+    def __init__(self, capacity):
+        self.size = 1
+        while self.size < capacity + 1:
+            self.size *= 2
+        self.tree = [EMPTY] * (2 * self.size)
+
+    def update(self, position, value):
+        tree = self.tree
+        index = position + self.size
+        tree[index] = value
+        index //= 2
+        while index:
+            left = tree[2 * index]
+            right = tree[2 * index + 1]
+            tree[index] = left if left < right else right
+            index //= 2
+
+    # Минимум значений листов с номерами не меньше position
+    def min_from(self, position):
+        tree = self.tree
+        result = EMPTY
+        left = position + self.size
+        right = 2 * self.size
+        while left < right:
+            if left & 1:
+                if tree[left] < result:
+                    result = tree[left]
+                left += 1
+            if right & 1:
+                right -= 1
+                if tree[right] < result:
+                    result = tree[right]
+            left //= 2
+            right //= 2
+        return result
+
+    # Номер первого непустого листа, не меньшего position, или -1
+    def first_from(self, position):
+        tree = self.tree
+        index = position + self.size
+        if tree[index] < EMPTY:
+            return position
+        while index > 1:
+            if index % 2 == 0 and tree[index + 1] < EMPTY:
+                index += 1
+                while index < self.size:
+                    index = 2 * index if tree[2 * index] < EMPTY else 2 * index + 1
+                return index - self.size
+            index //= 2
+        return -1
+
+
+# Первый подходящий по убыванию размера (first-fit decreasing): задачи упорядочиваются
+# по убыванию размера, каждая кладется в фрейм с наименьшим номером, где хватает места.
+# Возвращает порядок обработки задач и номер фрейма для каждой задачи в этом порядке
+def first_fit_decreasing(sizes, capacity):
+    order = np.argsort(-sizes, kind='stable')
+    frame_ids = np.empty(len(sizes), dtype=np.int64)
+    tree = CapacityTree(capacity)
+    groups = {} # Остаточная вместимость -> куча номеров фреймов
+    residuals = [] # Остаточная вместимость каждого фрейма
+    for position, size in enumerate(sizes[order].tolist()):
+        frame = tree.min_from(size) if size <= capacity else EMPTY
+        if frame == EMPTY:
+            # Ни в одном фрейме нет места - открывает новый
+            frame = len(residuals)
+            residuals.append(capacity)
+        else:
+            group = groups[residuals[frame]]
+            heapq.heappop(group) # Фрейм с наименьшим номером - вершина кучи группы
+            tree.update(residuals[frame], group[0] if group else EMPTY)
+        residual = max(residuals[frame] - size, 0)
+        residuals[frame] = residual
+        group = groups.setdefault(residual, [])
+        heapq.heappush(group, frame)
+        tree.update(residual, group[0])
+        frame_ids[position] = frame
+    return order, frame_ids
+
+
+# Наилучший подходящий (best-fit): задачи обрабатываются в порядке поступления,
+# каждая кладется в фрейм с наименьшим достаточным свободным местом
+def best_fit(sizes, capacity):
+    order = np.arange(len(sizes))
+    frame_ids = np.empty(len(sizes), dtype=np.int64)
+    tree = CapacityTree(capacity)
+    groups = {} # Остаточная вместимость -> стек номеров фреймов
+    frames_count = 0
+    for position, size in enumerate(sizes.tolist()):
+        residual = tree.first_from(size) if size <= capacity else -1
+        if residual < 0:
+            frame = frames_count
+            frames_count += 1
+            residual = capacity
+        else:
+            group = groups[residual]
+            frame = group.pop()
+            if not group:
+                tree.update(residual, EMPTY)
+        residual = max(residual - size, 0)
+        group = groups.setdefault(residual, [])
+        group.append(frame)
+        tree.update(residual, 0)
+        frame_ids[position] = frame
+    return order, frame_ids
+
+
+# Стратегии упаковки, использующие индекс вместимости; next_fit реализован
+# потоковой упаковкой DataChannel.pack_frames
+PACKING_STRATEGIES = {
+    'first_fit_decreasing': first_fit_decreasing,
+    'best_fit': best_fit,
+}
@@ -0,0 +1,121 @@
+import json # Для выгрузки сводки в машиночитаемом виде
+import random # Для случайных интервалов выборочного режима
+import time
+
+
+# Таймер фазы для использования в блоке with
+class Timer:
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.started = None
+
+    def __enter__(self):
+        self.started = self.profiler.start(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.stop(self.name, self.started)
+        return False
+
+
+# Заглушка таймера выключенного профилировщика: ничего не измеряет
+class NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_TIMER = NullTimer()
+
+
+# Профилировщик фаз симуляции: именованные таймеры (время по time.perf_counter) и счетчики.
+# В выключенном состоянии методы сразу возвращаются, поэтому замеры можно оставлять в горячих циклах.
+# sample_every > 1 включает выборочный режим: измеряется в среднем каждый N-й вызов таймера, а общее
+# время оценивается по доле измеренных вызовов. Интервал между замерами случайный (от 1 до 2N - 1),
+# чтобы замеры не совпадали с периодическими событиями (например, сбросом буфера каждые 65536 задач)
+class Profiler:
+    def __init__(self, enabled=True, sample_every=1, seed=0):
+        self.enabled = enabled
+        self.sample_every = sample_every
+        self.rng = random.Random(seed)
+        # Имя -> [вызовы, измеренные вызовы, время измеренных (сек), минимум, максимум, вызовов до замера]
+        self.timers = {}
+        self.counters = {} # Имя -> значение счетчика
+
+    # Таймер для блока with: with profiler.timer('channel.transmit'): ...
+    def timer(self, name):
+        if not self.enabled:
+            return NULL_TIMER
+        return Timer(self, name)
+
+    # Начинает замер; возвращает отметку времени или None, если вызов не измеряется
+    def start(self, name):
+        if not self.enabled:
+            return None
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = [0, 0, 0.0, None, None, 1]
+        timer[0] += 1
+        if self.sample_every > 1:
+            timer[5] -= 1
+            if timer[5]:
+                return None
+            timer[5] = self.rng.randint(1, 2 * self.sample_every - 1)
+        return time.perf_counter()
+
+    # Завершает замер, начатый start
+    def stop(self, name, started):
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        timer = self.timers[name]
+        timer[1] += 1
+        timer[2] += elapsed
+        timer[3] = elapsed if timer[3] is None else min(timer[3], elapsed)
+        timer[4] = elapsed if timer[4] is None else max(timer[4], elapsed)
+
+    # Увеличивает счетчик name на value
+    def count(self, name, value=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    # Сводка: по таймерам - количество вызовов, измеренных вызовов, измеренное и оценочное
+    # общее время, среднее, минимум и максимум (сек); счетчики - как есть
+    def summary(self):
+        timers = {}
+        for name, (calls, sampled, total, minimum, maximum, _) in self.timers.items():
+            mean = total / sampled if sampled else 0.0
+            timers[name] = {
+                'calls': calls,
+                'sampled': sampled,
+                'measured_seconds': total,
+                'estimated_seconds': mean * calls,
+                'mean_seconds': mean,
+                'min_seconds': minimum,
+                'max_seconds': maximum,
+            }
+        return {'sample_every': self.sample_every, 'timers': timers, 'counters': dict(self.counters)}
+
+    # Записывает сводку в JSON-файл
+    def export(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.summary(), file, indent=2, ensure_ascii=False)
+
+    # Печатает таймеры по убыванию оценочного времени и счетчики
+    def print_summary(self):
+        summary = self.summary()
+        for name, timer in sorted(summary['timers'].items(), key=lambda item: -item[1]['estimated_seconds']):
+            print(f"{name}: {timer['estimated_seconds']:.6f} seconds, {timer['calls']} calls, "
+                  f"mean {timer['mean_seconds'] * 10 ** 6:.3f} us")
+        for name, value in summary['counters'].items():
+            print(f"{name}: {value}")
+
+
+NULL_PROFILER = Profiler(enabled=False) # Общий выключенный профилировщик по умолчанию
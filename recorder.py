@@ -0,0 +1,196 @@
+import csv # Для записи данных о выполнении задач в CSV-файл
+import os
+import numpy as np
+from profiler import NULL_PROFILER
+
+# Заголовок CSV-файла с временем выполнения задач
+CSV_HEADER = [
+    "Имя задачи", # Название столбца для имени задачи
+    "Время начала выполнения задачи",  # Название столбца для времени начала
+    "Время конца выполнения задачи", # Название столбца для времени окончания
+    "Общее время выполнения", # Название столбца для общего времени выполнения
+    "Имя процессора",  # Название столбца для имени процессора
+    "Имя ядра", # Название столбца для имени ядра
+    "Тип задачи" # Название столбца для типа задачи
+]
+
+# Столбцы бинарного формата: имя задачи, такты начала и конца, индексы процессора, ядра и типа задачи
+COLUMNS = (('name', np.int64), ('start', np.int64), ('end', np.int64), ('processor', np.int32), ('core', np.int32),
+           ('type', np.int8))
+
+
+# Накопитель времени выполнения задач: хранит записи в заранее выделенных
+# типизированных массивах и сбрасывает их на диск блоками.
+# csv_path - CSV-файл в прежнем формате, binary_dir - каталог с .npy-файлом на каждый столбец,
+# profiler - замеры времени сброса блоков (profiler.py)
+class TaskTimeRecorder:
+    def __init__(self, csv_path='task_times.csv', binary_dir=None, clock_speed=10 ** 9, chunk_size=65536,
+                 profiler=None):
+        self.csv_path = csv_path
+        self.binary_dir = binary_dir
+        self.clock_speed = clock_speed # Частота процессора для перевода тактов в секунды
+        self.chunk_size = chunk_size # Количество записей в блоке
+        self.profiler = profiler or NULL_PROFILER
+        self.buffers = {column: np.empty(chunk_size, dtype=dtype) for column, dtype in COLUMNS}
+        self.size = 0 # Количество записей в текущем блоке
+        self.total = 0 # Количество записей, сброшенных на диск
+        self.processor_names = [] # Имена процессоров, индекс в списке хранится в столбце processor
+        self.core_names = [] # Имена ядер, индекс в списке хранится в столбце core
+        self.processor_index = {}
+        self.core_index = {}
+        self.type_names = [] # Имена типов задач, индекс в списке хранится в столбце type
+        self.type_index = {}
+
+    # Создает (очищает) выходные файлы
+    def start(self):
+        self.size = 0
+        self.total = 0
+        if self.csv_path:
+            with open(self.csv_path, 'w', newline='', encoding='utf-8') as csvfile:
+                csv.writer(csvfile).writerow(CSV_HEADER)
+        if self.binary_dir:
+            os.makedirs(self.binary_dir, exist_ok=True)
+            for column, _ in COLUMNS:
+                open(self.column_part_path(column), 'wb').close()
+
+    # Сбрасывает записи на диск и возвращает состояние для контрольной точки: количество
+    # записей, имена процессоров и ядер и размеры выходных файлов
+    def checkpoint(self):
+        self.flush()
+        sizes = {}
+        if self.csv_path:
+            sizes[self.csv_path] = os.path.getsize(self.csv_path)
+        if self.binary_dir:
+            for column, _ in COLUMNS:
+                sizes[self.column_part_path(column)] = os.path.getsize(self.column_part_path(column))
+        return {'total': self.total, 'processor_names': list(self.processor_names),
+                'core_names': list(self.core_names), 'type_names': list(self.type_names), 'sizes': sizes}
+
+    # Продолжает запись с контрольной точки вместо start: записи, сделанные после нее, удаляются
+    def resume(self, state):
+        self.size = 0
+        self.total = state['total']
+        self.processor_names = list(state['processor_names'])
+        self.core_names = list(state['core_names'])
+        self.processor_index = {name: index for index, name in enumerate(self.processor_names)}
+        self.core_index = {name: index for index, name in enumerate(self.core_names)}
+        self.type_names = list(state['type_names'])
+        self.type_index = {name: index for index, name in enumerate(self.type_names)}
+        if self.binary_dir:
+            for column, _ in COLUMNS:
+                # Если прерванный запуск успел собрать столбец в .npy, временный файл восстанавливается из него
+                npy_path = os.path.join(self.binary_dir, f'{column}.npy')
+                if not os.path.exists(self.column_part_path(column)) and os.path.exists(npy_path):
+                    np.load(npy_path).tofile(self.column_part_path(column))
+        for path, size in state['sizes'].items():
+            with open(path, 'r+b') as file:
+                file.truncate(size)
+
+    def column_part_path(self, column):
+        return os.path.join(self.binary_dir, f'{column}.part')
+
+    # Индексы имен процессора и ядра в столбцах processor и core
+    def register(self, processor_name, core_name):
+        processor = self.processor_index.get(processor_name)
+        if processor is None:
+            processor = self.processor_index[processor_name] = len(self.processor_names)
+            self.processor_names.append(processor_name)
+        core = self.core_index.get(core_name)
+        if core is None:
+            core = self.core_index[core_name] = len(self.core_names)
+            self.core_names.append(core_name)
+        return processor, core
+
+    # Индекс имени типа задачи в столбце type
+    def register_type(self, task_type):
+        index = self.type_index.get(task_type)
+        if index is None:
+            index = self.type_index[task_type] = len(self.type_names)
+            self.type_names.append(task_type)
+        return index
+
+    # Добавляет запись о выполненной задаче (время в тактах)
+    def record(self, name, start_time, end_time, processor_name, core_name, task_type):
+        processor, core = self.register(processor_name, core_name)
+        position = self.size
+        buffers = self.buffers
+        buffers['name'][position] = name
+        buffers['start'][position] = start_time
+        buffers['end'][position] = end_time
+        buffers['processor'][position] = processor
+        buffers['core'][position] = core
+        buffers['type'][position] = self.register_type(task_type)
+        self.size += 1
+        if self.size == self.chunk_size:
+            self.flush()
+
+    # Добавляет блок записей из массивов; processors и cores - индексы, полученные через register,
+    # types - индексы register_type
+    def record_many(self, names, start_times, end_times, processors, cores, types):
+        columns = (('name', names), ('start', start_times), ('end', end_times), ('processor', processors),
+                   ('core', cores), ('type', types))
+        position = 0
+        while position < len(names):
+            count = min(self.chunk_size - self.size, len(names) - position)
+            for column, values in columns:
+                self.buffers[column][self.size:self.size + count] = values[position:position + count]
+            self.size += count
+            position += count
+            if self.size == self.chunk_size:
+                self.flush()
+
+    # Сбрасывает текущий блок записей на диск
+    def flush(self):
+        count = self.size
+        if not count:
+            return
+        started = self.profiler.start('io.recorder_flush')
+        columns = {column: buffer[:count] for column, buffer in self.buffers.items()}
+        if self.csv_path:
+            start = columns['start'] / self.clock_speed
+            end = columns['end'] / self.clock_speed
+            duration = (columns['end'] - columns['start']) / self.clock_speed
+            with open(self.csv_path, 'a', newline='', encoding='utf-8') as csvfile:
+                csv.writer(csvfile).writerows(zip(
+                    columns['name'].tolist(),
+                    [f"{value:.9f}" for value in start.tolist()],
+                    [f"{value:.9f}" for value in end.tolist()],
+                    [f"{value:.9f}" for value in duration.tolist()],
+                    [self.processor_names[index] for index in columns['processor'].tolist()],
+                    [self.core_names[index] for index in columns['core'].tolist()],
+                    [self.type_names[index] for index in columns['type'].tolist()]
+                ))
+        if self.binary_dir:
+            for column, values in columns.items():
+                with open(self.column_part_path(column), 'ab') as file:
+                    values.tofile(file)
+        self.total += count
+        self.size = 0
+        self.profiler.count('io.recorder_records', count)
+        self.profiler.stop('io.recorder_flush', started)
+
+    # Сбрасывает оставшиеся записи и собирает столбцы бинарного формата в .npy-файлы
+    def close(self):
+        self.flush()
+        if not self.binary_dir:
+            return
+        for column, dtype in COLUMNS:
+            part_path = self.column_part_path(column)
+            np.save(os.path.join(self.binary_dir, f'{column}.npy'), np.fromfile(part_path, dtype=dtype))
+            os.remove(part_path)
+        np.save(os.path.join(self.binary_dir, 'processor_names.npy'), np.array(self.processor_names, dtype=str))
+        np.save(os.path.join(self.binary_dir, 'core_names.npy'), np.array(self.core_names, dtype=str))
+        np.save(os.path.join(self.binary_dir, 'type_names.npy'), np.array(self.type_names, dtype=str))
+        np.save(os.path.join(self.binary_dir, 'clock_speed.npy'), np.array(self.clock_speed, dtype=np.int64))
+
+
+# Загружает бинарный формат: словарь столбцов, отображенных в память без чтения целиком.
+# Столбца типа задачи нет в каталогах, записанных до его появления
+def load_task_times(binary_dir):
+    columns = {column: np.load(os.path.join(binary_dir, f'{column}.npy'), mmap_mode='r') for column, _ in COLUMNS
+               if os.path.exists(os.path.join(binary_dir, f'{column}.npy'))}
+    for names in ('processor_names', 'core_names', 'type_names'):
+        if os.path.exists(os.path.join(binary_dir, f'{names}.npy')):
+            columns[names] = np.load(os.path.join(binary_dir, f'{names}.npy')).tolist()
+    columns['clock_speed'] = int(np.load(os.path.join(binary_dir, 'clock_speed.npy')))
+    return columns
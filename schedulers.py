@@ -0,0 +1,76 @@
+import heapq # Для очередей с приоритетом
+from queue import Queue
+
+
+# Очередь задач с приоритетом на основе кучи и интерфейсом queue.Queue (put, get, empty, qsize).
+# Задачи с одинаковым приоритетом выдаются в порядке поступления
+class HeapQueue:
+    def __init__(self, time_quantum=1):
+        self.time_quantum = time_quantum
+        self.heap = []
+        self.sequence = 0 # Порядковый номер добавления задачи
+
+    # Приоритет задачи: чем меньше значение, тем раньше задача будет выдана
+    def key(self, task):
+        raise NotImplementedError
+
+    def put(self, task):
+        heapq.heappush(self.heap, (self.key(task), self.sequence, task))
+        self.sequence += 1
+
+    # Добавляет задачи одним блоком и восстанавливает кучу за линейное время
+    def extend(self, tasks):
+        for task in tasks:
+            self.heap.append((self.key(task), self.sequence, task))
+            self.sequence += 1
+        heapq.heapify(self.heap)
+
+    def get(self):
+        return heapq.heappop(self.heap)[2]
+
+    def empty(self):
+        return not self.heap
+
+    def qsize(self):
+        return len(self.heap)
+
+
+# Сначала задачи с наименьшим оставшимся TTL (earliest deadline first)
+class EarliestTTLQueue(HeapQueue):
+    def key(self, task):
+        return task.ttl
+
+
+# Сначала задачи с наименьшим остатком операций (shortest remaining first)
+class ShortestRemainingQueue(HeapQueue):
+    def key(self, task):
+        return task.remaining_operations
+
+
+# Многоуровневая очередь с обратной связью: задача опускается на уровень ниже по мере
+# выполнения. Уровень k соответствует 2^k - 1 и более выполненным квантам, то есть каждый
+# следующий уровень вдвое длиннее предыдущего. Внутри уровня задачи выдаются по порядку поступления
+class MultilevelFeedbackQueue(HeapQueue):
+    levels = 4 # Количество уровней
+
+    def key(self, task):
+        quanta = (task.ticks_to_complete - task.remaining_operations) // max(self.time_quantum, 1)
+        return min((quanta + 1).bit_length() - 1, self.levels - 1)
+
+
+# Политики планирования: round_robin - очередь FIFO
+SCHEDULERS = {
+    'round_robin': None,
+    'earliest_ttl': EarliestTTLQueue,
+    'shortest_remaining': ShortestRemainingQueue,
+    'mlfq': MultilevelFeedbackQueue,
+}
+
+
+# Создает очередь задач для политики планирования
+def make_task_queue(scheduler, time_quantum):
+    if scheduler not in SCHEDULERS:
+        raise ValueError(f'Unknown scheduler {scheduler!r}, expected one of {", ".join(SCHEDULERS)}')
+    if SCHEDULERS[scheduler] is None:
+        return Queue()
+    return SCHEDULERS[scheduler](time_quantum)
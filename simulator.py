@@ -0,0 +1,1307 @@
+import os # Для работы с файлами контрольных точек
+import time # Для имитации задержек и расчета времени
+import heapq # Для очереди освобождения каналов передачи
+from array import array # Для компактного хранения индексов задач во фреймах
+import numpy as np # Для генерации задач и хранения их в таблице
+from pythonProject.stats.statistics import Statistics
+from task_table import TaskTable, TaskQueue, STATUS_CODES
+from packing import PACKING_STRATEGIES
+from recorder import TaskTimeRecorder
+from logs import LogWriter, LEVELS, TRACE, DEBUG, INFO, NULL_LOG_WRITER
+from batch_executor import BatchExecutor, COMPLETED, EXPIRED, REQUEUED
+from trace_replay import load_trace
+from schedulers import make_task_queue
+from dispatch import FreeCoreIndex
+from profiler import Profiler, NULL_PROFILER
+from checkpoint import Checkpointer, load_checkpoint, CHECKPOINT_VERSION
+from timeline import TimelineWriter
+from allocator import MemoryAllocator
+from workload_cache import WorkloadCache, records_to_table
+
+
+MEMORY_SIZE = 8 * (1024**3) * 32 # Объем памяти по умолчанию в битах (32 ГиБ)
+
+
+class MemoryException(Exception):
+    def __init__(self, message='Memory overflow occured', memory_used=0, memory_limit=0):
+        self.message = message
+        self.memory_used = memory_used
+        self.memory_limit = memory_limit
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f'{self.message}. Used {self.memory_used}. Memory limit {self.memory_limit}. Overflowing: {(self.memory_used/self.memory_limit) * 100}'
+
+
+# Часы симуляции. В реальном режиме задержки выполняются через time.sleep,
+# в виртуальном - только откладываются на временной шкале системы.
+# В обоих режимах накопленные задержки попадают в отчет о работе системы
+class SimulationClock:
+    def __init__(self, virtual=False):
+        self.virtual = virtual # Виртуальный режим времени
+        self.memory_latency = 0 # Суммарная задержка взаимодействия с памятью (сек)
+        self.transfer_time = 0 # Суммарное время передачи данных по каналу (сек)
+
+    def reset(self):
+        self.memory_latency = 0
+        self.transfer_time = 0
+
+    # blocking=False - задержка только учитывается в отчете (передача идет одновременно с выполнением)
+    def delay(self, seconds, kind='memory', blocking=True):
+        if kind == 'memory':
+            self.memory_latency += seconds
+        else:
+            self.transfer_time += seconds
+        if not self.virtual and blocking:
+            time.sleep(seconds)
+
+    # Общее время подготовки данных в тактах процессора. overlapped=True - передача
+    # идет одновременно с выполнением и в подготовку не входит
+    def setup_cycles(self, clock_speed, overlapped=False):
+        if overlapped:
+            return round(self.memory_latency * clock_speed)
+        return round((self.memory_latency + self.transfer_time) * clock_speed)
+
+
+# Функция для инициализации лог-файлов системы и процессоров
+def initialize_logs(log_writer, processors_count):
+    # Создает и очищает общий системный лог
+    log_writer.reset("SystemLOG.txt", "=== System Logs ===\n")
+    # Создает и очищает лог-файлы для каждого процессора
+    for processor_id in range(processors_count):
+        log_writer.reset(f"Processor-{processor_id}_log.txt", f"=== Logs for Processor-{processor_id} ===\n")
+
+
+# Класс, представляющий канал передачи данных
+class DataChannel:
+    speed = 100 * (10 ** 9) # Скорость передачи данных в битах/сек (100 Гбит/с)
+
+    # packing - стратегия упаковки задач во фреймы: 'next_fit' (фрейм закрывается, как только
+    # очередная задача в него не влезла), 'first_fit_decreasing' или 'best_fit' (см. packing.py).
+    # channels - количество параллельных каналов, in_flight - наибольшее количество отправленных,
+    # но еще не пришедших фреймов (None - без ограничения), link_latency - задержка распространения (сек).
+    # pipelined=True - задачи фрейма доступны для выполнения сразу после его прихода (см. frame_arrival_times)
+    def __init__(self, memory, packing='next_fit', channels=1, in_flight=None, link_latency=0.0, pipelined=False):
+        if channels < 1:
+            raise ValueError('At least one channel is required')
+        if in_flight is not None and in_flight < 1:
+            raise ValueError('At least one frame must be allowed in flight')
+        self.memory = memory # Память с задачами
+        self.simulation = memory.simulation # Запуск симуляции, которому принадлежит канал
+        self.packing = packing
+        self.channels = channels
+        self.in_flight = in_flight
+        self.link_latency = link_latency
+        self.pipelined = pipelined
+        self.frames = [] # Список Ethernet-фреймов
+        self.arrival_times = [] # Время прихода каждого фрейма от начала передачи (сек)
+        self.packing_report = {} # Итоги упаковки: количество фреймов, средняя заполненность, время передачи
+        self.ethernet_frame_size = 12144 # Максимальный размер Ethernet-фрейма в битах
+        self.min_ethernet_frame_size = 512 # Минимальный размер Ethernet-фрейма в битах
+        self.headers_size = 144 # Размер заголовков Ethernet-фрейма
+
+    # Распределяет задачи по Ethernet-фреймам
+    def calculate_frames(self):
+        with self.simulation.profiler.timer('channel.calculate_frames'):
+            if self.packing == 'next_fit':
+                self.frames = list(self.pack_frames([self.memory.tasks]))
+            else:
+                self.frames = self.pack_frames_indexed(self.memory.tasks)
+        self.simulation.profiler.count('channel.frames', len(self.frames))
+        self.simulation.report(f"Total Ethernet frames required: {len(self.frames)}")  # Выводит количество фреймов
+        if self.simulation.log_writer.enabled_for(DEBUG):
+            for frame in self.frames:
+                self.simulation.print_system_logs(str(frame), 0, DEBUG)  # Записывает содержимое каждого фрейма в лог
+        return len(self.frames) # Возвращает общее количество фреймов
+
+    # Упаковывает задачи из последовательности таблиц в фреймы по мере их поступления.
+    # Незаполненный фрейм переносится на следующую таблицу, поэтому разбиение
+    # не зависит от того, пришли задачи одной таблицей или частями
+    def pack_frames(self, tables):
+        frame_capacity = self.ethernet_frame_size - self.headers_size
+        frame = None
+        for table in tables:
+            first_index = 0
+            if frame is not None and frame.task_indices:
+                # Переносит задачи незаполненного фрейма в начало новой таблицы
+                carried = np.frombuffer(frame.task_indices, dtype=np.int64)
+                table = TaskTable.concat([frame.table.take(carried), table])
+                first_index = len(carried)
+                frame = Frame(table)
+                for index, size in enumerate(table.size[:first_index].tolist()):
+                    frame.add(index, size)
+            else:
+                frame = Frame(table) # Создает новый фрейм
+            for index, size in enumerate(table.size[first_index:].tolist(), first_index):
+                # Проверяет, влезает ли задача в текущий фрейм
+                if size + frame.occupied_space <= frame_capacity:
+                    frame.add(index, size) # Добавляет задачу в фрейм
+                else:
+                    yield frame  # Заканчивает текущий фрейм
+                    frame = Frame(table) # Создает новый фрейм
+                    frame.add(index, size) # Добавляет задачу в новый фрейм
+        if frame is not None:
+            yield frame # Последний фрейм
+
+    # Сохраняет и печатает итоги упаковки для сравнения стратегий
+    def report_packing(self, frames_count, total_fill_percentage, transfer_time):
+        self.packing_report = {
+            'packing': self.packing,
+            'frames': frames_count,
+            'mean_fill_percentage': total_fill_percentage / frames_count if frames_count else 0,
+            'transfer_time': transfer_time,
+        }
+        self.simulation.report(f"Packing {self.packing}: {frames_count} frames, mean fill "
+              f"{self.packing_report['mean_fill_percentage']:.2f}%, transmit time {transfer_time} seconds.")
+
+    # Упаковывает всю таблицу задач стратегией self.packing из PACKING_STRATEGIES.
+    # Порядок фреймов - порядок их открытия, задачи внутри фрейма - в порядке добавления
+    def pack_frames_indexed(self, table):
+        frame_capacity = self.ethernet_frame_size - self.headers_size
+        if not len(table):
+            return [Frame(table)]
+        order, frame_ids = PACKING_STRATEGIES[self.packing](table.size, frame_capacity)
+        by_frame = np.argsort(frame_ids, kind='stable')
+        task_order = order[by_frame]
+        frame_lengths = np.bincount(frame_ids)
+        frame_sizes = np.add.reduceat(table.size[task_order].astype(np.int64), np.cumsum(frame_lengths) - frame_lengths)
+        frames = []
+        for indices, occupied_space in zip(np.split(task_order, np.cumsum(frame_lengths)[:-1]), frame_sizes.tolist()):
+            frame = Frame(table)
+            frame.task_indices = array('q', indices.tobytes())
+            frame.occupied_space = occupied_space
+            frames.append(frame)
+        return frames
+
+    # Потоковая передача: упаковывает и передает фреймы по одному, не храня их.
+    # Ведет те же итоги, что и transmit (время передачи, суммарный размер)
+    def stream(self, tables):
+        self.frames_count = 0
+        self.transfer_time = 0
+        self.total_tasks_size = 0
+        total_fill_percentage = 0
+        profiler = self.simulation.profiler
+        for frame in self.pack_frames(tables):
+            frame_transfer_time = frame.get_frame_size() / self.speed
+            self.frames_count += 1
+            self.transfer_time += frame_transfer_time
+            self.total_tasks_size += frame.get_occupied_space()
+            frame.frame_fill_percentage = (frame.get_occupied_space() / self.ethernet_frame_size) * 100
+            total_fill_percentage += frame.frame_fill_percentage
+            if self.simulation.allocator is None and self.total_tasks_size > self.memory.size:
+                raise MemoryException(memory_used=self.total_tasks_size, memory_limit=self.memory.size)
+            started = profiler.start('delay.transfer')
+            self.simulation.clock.delay(frame_transfer_time, 'transfer')
+            profiler.stop('delay.transfer', started)
+            profiler.count('channel.frames')
+            yield frame
+        self.report_packing(self.frames_count, total_fill_percentage, self.transfer_time)
+
+    # Время прихода каждого фрейма (сек от начала передачи). Фреймы отправляются по порядку:
+    # очередной фрейм занимает канал, освободившийся раньше других, на frame_size/speed секунд
+    # и приходит через link_latency после окончания передачи (frame_size - полный размер фрейма
+    # с заголовками и дополнением до минимума, как и в потоковой передаче). При ограничении in_flight фрейм
+    # отправляется только после прихода всех фреймов, отправленных на in_flight позиций раньше
+    def frame_arrival_times(self, frame_sizes):
+        channel_free = [0.0] * self.channels # Куча моментов освобождения каналов
+        arrivals = []
+        acknowledged = 0.0 # Момент прихода всех фреймов вне окна
+        for position, frame_size in enumerate(frame_sizes):
+            start = heapq.heappop(channel_free)
+            if self.in_flight is not None and position >= self.in_flight:
+                acknowledged = max(acknowledged, arrivals[position - self.in_flight])
+                start = max(start, acknowledged)
+            end = start + frame_size / self.speed
+            heapq.heappush(channel_free, end)
+            arrivals.append(end + self.link_latency)
+        return arrivals
+
+    # Передает данные (фреймы) через канал
+    def transmit(self):
+        with self.simulation.profiler.timer('channel.transmit'):
+            return self.transmit_frames()
+
+    def transmit_frames(self):
+        total_frames = self.calculate_frames() # Рассчитывает фреймы
+        frame_sizes = [] # Размеры фреймов вместе с заголовками
+        total_tasks_size = 0
+        for frame in self.frames:
+            frame_sizes.append(frame.get_frame_size())
+            total_tasks_size += frame.get_occupied_space()
+            frame.frame_fill_percentage = (frame.get_occupied_space() / self.ethernet_frame_size) * 100
+        self.arrival_times = self.frame_arrival_times(frame_sizes)
+        transfer_time = max(self.arrival_times, default=0) # Время передачи - приход последнего фрейма
+        self.simulation.report(f"Total transfer time: {transfer_time} seconds.") # Печатает общее время передачи
+        self.simulation.report(f"Total size of all tasks: {total_tasks_size} bits")  # Печатает общий размер всех задач
+        self.report_packing(total_frames, sum(frame.frame_fill_percentage for frame in self.frames), transfer_time)
+        with self.simulation.profiler.timer('delay.transfer'):
+            # Имитация времени передачи данных; при конвейерной передаче выполнение ее не ждет
+            self.simulation.clock.delay(transfer_time, 'transfer', blocking=not self.pipelined)
+        # С моделью памяти задачи размещаются по мере поступления и ждут освобождения памяти
+        if self.simulation.allocator is None and total_tasks_size > self.memory.size:
+            raise MemoryException(memory_used=total_tasks_size, memory_limit=self.memory.size)
+        return self.frames  # Возвращает список фреймов
+
+
+# Класс для Ethernet-фрейма, содержащего задачи
+class Frame:
+    __slots__ = ('max_size', 'headers_size', 'table', 'task_indices', 'occupied_space', 'frame_fill_percentage')
+
+    def __init__(self, table=None):
+        self.max_size = 12144 # Максимальный размер фрейма (бит)
+        self.headers_size = 144  # Размер заголовков (бит)
+        self.table = table # Таблица задач, к которой относятся задачи фрейма
+        self.task_indices = array('q') # Индексы задач фрейма в таблице задач
+        self.occupied_space = 0 # Занятое пространство в фрейме (бит)
+        self.frame_fill_percentage = 0
+
+    # Список задач в фрейме (строки таблицы задач)
+    @property
+    def tasks(self):
+        return [self.table.row(index) for index in self.task_indices]
+
+    # Форматирует строковое представление фрейма
+    def __str__(self):
+        tasks_info = ", ".join([str(task) for task in self.tasks])
+        return f"Frame with {len(self.task_indices)} tasks (Occupied space: {self.occupied_space} bits): [{tasks_info}. Fulness: {self.frame_fill_percentage}]"
+
+    # Возвращает текущее занятое пространство в фрейме
+    def get_occupied_space(self):
+        return self.occupied_space
+
+    # Возвращает полный размер фрейма (включая минимальный размер)
+    def get_frame_size(self):
+        if self.occupied_space + 144 < 512: # Если фрейм меньше минимального
+            return 512 # Возвращает минимальный размер
+        else:
+            return self.occupied_space + 144 # Возвращает фактический размер
+
+    # Добавляет задачу в фрейм
+    def add_task(self, task):
+        self.table = task.table
+        self.add(task.index, task.size)
+
+    # Добавляет задачу по индексу строки таблицы задач
+    def add(self, index, size):
+        self.task_indices.append(index) # Добавляет задачу в список задач
+        self.occupied_space += size # Увеличивает занятое пространство фрейма
+
+
+# Класс, реализующий алгоритм планирования Round Robin
+class RoundRobin:
+    # streaming=True включает потоковый конвейер: задачи генерируются частями, упаковываются
+    # во фреймы по мере поступления и подаются в очередь не более buffer_size штук за раз.
+    # В этом режиме выполненные задачи не хранятся списками, учитываются только счетчики.
+    # seed - зерно генерации задач (None - случайное).
+    # trace - путь к JSONL-трассе задач: задачи читаются из нее потоково (режим streaming
+    # включается автоматически) и попадают в очередь не раньше своего такта поступления.
+    # scheduler - политика выбора задачи из очереди: round_robin (FIFO), earliest_ttl,
+    # shortest_remaining или mlfq (см. schedulers.py).
+    # Все состояние запуска принадлежит объекту: часы (clock), запись логов (log_writer),
+    # накопитель времени выполнения (recorder), статистика и счетчики. delay_range - интервал
+    # задержки взаимодействия с памятью (сек), verbose - печатать ли итоги на экран.
+    # profiler - замеры времени фаз симуляции (profiler.py), по умолчанию выключены.
+    # checkpointer - периодические контрольные точки (checkpoint.py), см. checkpoint_state.
+    # timeline_dir - каталог временной шкалы занятости ядер (timeline.py), None - не записывать.
+    # channels, in_flight, link_latency - модель канала передачи (см. DataChannel); pipelined=True -
+    # конвейерная передача: выполнение начинается сразу после подготовки данных в памяти, а задачи
+    # фрейма попадают в очередь на такте его прихода.
+    # memory_size - объем памяти в битах; memory_model=True - модель занятости памяти (allocator.py):
+    # задача занимает size бит при поступлении в очередь и освобождает их при завершении или истечении
+    # TTL, при нехватке памяти поступление задач откладывается. memory_sample_interval - период
+    # замеров занятости памяти в тактах. workload_cache - каталог кэша сгенерированных нагрузок (см. Memory)
+    def __init__(self, time_quantum, processors_count, config,num_tasks, num_cores, streaming=False,
+                 buffer_size=1024, packing='next_fit', seed=None, trace=None, scheduler='round_robin',
+                 clock=None, log_writer=None, recorder=None, delay_range=(0.0, 0.0), verbose=True, profiler=None,
+                 checkpointer=None, timeline_dir=None, channels=1, in_flight=None, link_latency=0.0, pipelined=False,
+                 memory_size=MEMORY_SIZE, memory_model=False, memory_sample_interval=1000, workload_cache=None):
+        streaming = streaming or trace is not None
+        if streaming and packing != 'next_fit':
+            raise ValueError('Streaming mode packs frames on the fly and supports only next_fit packing')
+        if streaming and (pipelined or channels != 1 or in_flight is not None or link_latency):
+            raise ValueError('Streaming mode transmits frames over a single sequential link')
+        if streaming and checkpointer is not None:
+            raise ValueError('Checkpoints require the whole task table and do not support streaming')
+        self.checkpointer = checkpointer
+        self.profiler = profiler or NULL_PROFILER # Замеры времени фаз симуляции
+        self.clock = clock or SimulationClock(virtual=True) # Часы симуляции (реальные или виртуальные задержки)
+        self.clock.reset()
+        # Буферизованная запись системного лога и логов процессоров; без нее сообщения отбрасываются
+        self.log_writer = log_writer or NULL_LOG_WRITER
+        self.recorder = recorder or TaskTimeRecorder(csv_path=None) # Накопитель времени выполнения задач
+        self.stats = Statistics(clock_speed=Processor.clock_speed, time_quantum=time_quantum) # Статистика времени выполнения
+        self.counter = 0 # Количество выполненных задач
+        self.verbose = verbose
+        self.delay_start, self.delay_end = delay_range
+        # Генератор задержек памяти, независимый от генератора задач
+        self.delay_rng = np.random.default_rng(np.random.SeedSequence(seed).spawn(1)[0])
+        # Распределитель памяти задач (None - занятость памяти не моделируется)
+        self.allocator = MemoryAllocator(memory_size, memory_sample_interval) if memory_model else None
+        self.memory = Memory(config, num_tasks, self, seed=seed, streaming=streaming, trace=trace,
+                             size=memory_size, workload_cache=workload_cache) # Инициализация памяти с задачами
+        self.time_quantum = time_quantum  # Временной квант для алгоритма Round Robin
+        self.streaming = streaming
+        self.scheduler = scheduler # Политика планирования
+        self.buffer_size = buffer_size # Максимальное количество задач в очереди в потоковом режиме
+        # Канал передачи данных
+        self.data_channel = DataChannel(self.memory, packing, channels=channels, in_flight=in_flight,
+                                        link_latency=link_latency, pipelined=pipelined)
+        # Задачи, ожидающие прихода своего фрейма (конвейерная передача): индексы в порядке прихода,
+        # такты прихода и количество уже переданных в очередь
+        self.arrival_indices = None
+        self.arrival_cycles = None
+        self.arrival_position = 0
+        self.arrivals_count = 0
+        if streaming:
+            self.ethernet_frames = []
+            self.task_queue = make_task_queue(scheduler, time_quantum)
+            self.task_feed = self.feed_tasks(self.data_channel.stream(self.memory.stream_tasks()))
+            self.next_task = next(self.task_feed, None) # Следующая задача конвейера, еще не попавшая в очередь
+        else:
+            # Получает очередь задач из канала передачи данных
+            self.ethernet_frames = self.data_channel.transmit()
+            self.task_queue = self.get_tasks_from_data_channel(self.ethernet_frames)
+            self.next_task = None
+        self.frames_state = None # Массивы фреймов для контрольных точек (см. frames_checkpoint)
+        self.processors = [] # Список процессоров
+        self.completed_tasks = 0 # Количество завершенных задач
+        self.total_tasks = num_tasks # Общее количество задач
+        self.cycle_time = 0 # Время в тактах системы
+        # В виртуальном режиме задержки памяти и канала входят в шкалу тактов: выполнение начинается
+        # после подготовки данных. В потоковом режиме к этому моменту из канала получен только первый
+        # фрейм (задержки его памяти и передачи), остальные фреймы передаются во время выполнения
+        self.setup_cycles = self.clock.setup_cycles(Processor.clock_speed, overlapped=pipelined) \
+            if self.clock.virtual else 0
+        self.cycle_time = self.setup_cycles
+        if self.arrival_cycles is not None:
+            # Время прихода фрейма отсчитывается от начала передачи, то есть от конца подготовки
+            self.arrival_cycles += self.setup_cycles
+        if self.allocator is not None:
+            self.allocator.start_sampling(self.cycle_time)
+        for i in range(processors_count):
+            # Создает процессоры с заданным количеством ядер и добавляет их в список
+            processor = Processor(name=f"Processor-{i}", num_cores=num_cores, simulation=self)
+            self.processors.append(processor)
+        # Все ядра и типы задач регистрируются заранее: имена в файлах времени выполнения описывают
+        # всю конфигурацию, в том числе ядра без выполненных задач
+        for core in self.cores():
+            self.recorder.register(core.processor.name, core.name)
+        for task_type in self.memory.task_types:
+            self.recorder.register_type(task_type)
+        # Интервалы выполнения задач на ядрах
+        self.timeline = TimelineWriter(timeline_dir, self.cores()) if timeline_dir else None
+
+    # Выдает задачи фреймов по одной с задержкой взаимодействия с памятью
+    def feed_tasks(self, frames):
+        for frame in frames:
+            self.simulate_time_delay(len(frame.task_indices))
+            yield from frame.tasks
+
+    # Пополняет очередь задачами конвейера до размера буфера; задачи трассы
+    # попадают в очередь только после наступления такта поступления
+    def refill_queue(self):
+        if self.arrival_position < self.arrivals_count:
+            self.release_arrived_tasks()
+        while (self.next_task is not None and self.task_queue.qsize() < self.buffer_size
+               and self.next_task.arrival_time <= self.cycle_time
+               and (self.allocator is None or self.allocate_task(self.next_task))):
+            self.task_queue.put(self.next_task)
+            self.next_task = next(self.task_feed, None)
+
+    # Переносит в очередь задачи фреймов, пришедших к текущему такту (конвейерная передача)
+    def release_arrived_tasks(self):
+        end = int(np.searchsorted(self.arrival_cycles, self.cycle_time, side='right'))
+        if self.allocator is not None:
+            # Задачи поступают по порядку, пока им хватает памяти
+            table = self.memory.tasks
+            for position in range(self.arrival_position, end):
+                if not self.allocate_task(table.row(int(self.arrival_indices[position]))):
+                    end = position
+                    break
+        if end == self.arrival_position:
+            return
+        indices = self.arrival_indices[self.arrival_position:end]
+        if isinstance(self.task_queue, TaskQueue):
+            self.task_queue.put_indices(indices)
+        else:
+            self.task_queue.extend(self.memory.tasks.row(index) for index in indices.tolist())
+        self.arrival_position = end
+
+    # Размещает задачу в памяти; False - памяти сейчас не хватает
+    def allocate_task(self, task):
+        size = task.size
+        if size > self.allocator.capacity:
+            raise MemoryException(f'Task {task.name} does not fit in memory', memory_used=size,
+                                  memory_limit=self.allocator.capacity)
+        if self.allocator.allocate(task, size):
+            return True
+        self.allocator.stall(self.cycle_time)
+        return False
+
+    # Освобождает память завершенной задачи или задачи с истекшим TTL
+    def release_task_memory(self, task):
+        if self.allocator is not None:
+            self.allocator.free(task)
+
+    # Остались ли задачи в очереди, в конвейере или в еще не пришедших фреймах
+    def has_pending_tasks(self):
+        return not self.task_queue.empty() or self.next_task is not None or self.arrival_position < self.arrivals_count
+
+    def get_tasks_from_data_channel(self, data):
+        # Метод для извлечения задач из списка фреймов
+        frames = data # Список фреймов
+        # Задачи всех фреймов в порядке фреймов
+        indices = np.concatenate([np.frombuffer(frame.task_indices, dtype=np.int64) for frame in frames])
+        if self.scheduler == 'round_robin':
+            queue = TaskQueue(self.memory.tasks, capacity=len(self.memory.tasks)) # Создает очередь для задач
+        else:
+            # Очередь с приоритетом выбранной политики планирования
+            queue = make_task_queue(self.scheduler, self.time_quantum)
+        if self.data_channel.pipelined or self.allocator is not None:
+            # Задачи ждут прихода своего фрейма: такт прихода - от начала передачи с округлением вверх.
+            # Без конвейерной передачи все задачи приходят к началу выполнения и ждут только памяти
+            if self.data_channel.pipelined:
+                frame_cycles = np.ceil(np.array(self.data_channel.arrival_times) * Processor.clock_speed).astype(np.int64)
+            else:
+                frame_cycles = np.zeros(len(frames), dtype=np.int64)
+            arrival_cycles = np.repeat(frame_cycles, [len(frame.task_indices) for frame in frames])
+            order = np.argsort(arrival_cycles, kind='stable') # Фреймы, пришедшие одновременно, - в порядке отправки
+            self.arrival_indices = indices[order]
+            self.arrival_cycles = arrival_cycles[order]
+            self.arrivals_count = len(indices)
+        elif self.scheduler == 'round_robin':
+            queue.put_indices(indices)
+        else:
+            queue.extend(self.memory.tasks.row(index) for index in indices.tolist())
+        self.simulate_time_delay(len(indices))
+        return queue # Возвращает очередь задач
+
+    # Основной метод выполнения задач. mode='tick' - потактовая симуляция,
+    # mode='event' - событийная симуляция, mode='batch' - векторное выполнение
+    # на NumPy-массивах; результаты всех режимов совпадают
+    def execute(self, mode='tick'):
+        if mode == 'event':
+            return self.execute_events()
+        if mode == 'batch':
+            return self.execute_batch()
+        free_cores = FreeCoreIndex(self.cores()) # Индекс свободных ядер
+        active_cores = {} # Занятые ядра в порядке назначения задач (словарь сохраняет порядок)
+        profiler = self.profiler
+        self.refill_queue()
+        while self.has_pending_tasks() or active_cores:
+            self.cycle_time += 1 # Увеличивает счетчик времени
+            if self.allocator is not None:
+                self.allocator.sample(self.cycle_time)
+            self.refill_queue()
+            self.log_all_tasks_state(self.cycle_time) # Логирует состояние всех задач
+            started = profiler.start('execute.dispatch')
+            # Пока есть свободные ядра и очередь задач не пуста
+            while free_cores and not self.task_queue.empty():
+                core = free_cores.pop() # Свободное ядро с наименьшим номером
+                task = self.task_queue.get() # Извлекает задачу из очереди
+                task.status = "Working" # Устанавливает статус задачи "В работе"
+                core.assign_task(task, self.cycle_time) # Назначает задачу ядру
+                log_message = f"Task {task.name} assigned to Core {core.name}."
+                self.print_proc_logs(core.processor.name, log_message, self.cycle_time)
+                # Логирует факт назначения задачи
+                active_cores[core] = None # Добавляет ядро в активные
+            profiler.stop('execute.dispatch', started)
+
+            started = profiler.start('execute.run')
+            for core in list(active_cores):
+                core.execute_task(self.time_quantum, core.processor.name, self.task_queue,
+                                  self.completed_tasks, self.cycle_time)
+                # Выполняет задачу на ядре
+                if core.status is None: # Если ядро стало свободным
+                    del active_cores[core] # Удаляет ядро из активных
+                    free_cores.release(core)
+            profiler.stop('execute.run', started)
+            profiler.count('execute.cycles')
+
+            if not self.has_pending_tasks():
+                self.report_completion()
+                break
+            if self.checkpointer is not None and self.checkpointer.due(self.cycle_time):
+                self.checkpointer.save(self)
+
+    # Событийный режим: квант выполняется целиком в такте назначения в замкнутой форме
+    # (Task.run_quantum), а не пооперационно, и такты без событий (простой до поступления задач)
+    # пропускаются. Между тактами все ядра свободны, поэтому задачи такта назначаются ядрам
+    # по порядку, а исход кванта (завершение, истечение TTL, возврат в очередь) обрабатывается
+    # сразу - в том же порядке обхода ядер, что и в потактовом режиме. Сообщения логов
+    # формируются, только если их уровень включен
+    def execute_events(self):
+        cores = self.cores()
+        profiler = self.profiler
+        debug = self.log_writer.enabled_for(DEBUG)
+        time_quantum = self.time_quantum
+        self.refill_queue()
+        while self.has_pending_tasks():
+            # Переходит к ближайшему такту, на котором что-то происходит
+            if self.task_queue.empty() and self.next_task is not None:
+                # Система простаивает до поступления следующей задачи трассы
+                self.cycle_time = max(self.cycle_time + 1, self.next_task.arrival_time)
+            elif self.task_queue.empty() and self.arrival_position < self.arrivals_count:
+                # Система простаивает до прихода следующего фрейма
+                self.cycle_time = max(self.cycle_time + 1, int(self.arrival_cycles[self.arrival_position]))
+            else:
+                self.cycle_time += 1
+            cycle_time = self.cycle_time
+            if self.allocator is not None:
+                self.allocator.sample(cycle_time)
+            self.refill_queue()
+            task_queue = self.task_queue
+            self.log_all_tasks_state(cycle_time)
+            started = profiler.start('execute.dispatch')
+            # Задачи такта: ядра по порядку, пока очередь не пуста
+            dispatched = []
+            for core in cores:
+                if task_queue.empty():
+                    break
+                task = task_queue.get()
+                core.assign_task(task, cycle_time)
+                remaining_operations = task.remaining_operations
+                if debug:
+                    self.print_proc_logs(core.processor.name, f"Task {task.name} assigned to Core {core.name}.",
+                                         cycle_time)
+                dispatched.append((core, remaining_operations, task.run_quantum(time_quantum)))
+            profiler.stop('execute.dispatch', started)
+
+            started = profiler.start('execute.run')
+            for core, remaining_operations, outcome in dispatched:
+                processor = core.processor
+                if debug:
+                    core.log_execution(processor.name, cycle_time, remaining_operations)
+                if outcome == "Completed":
+                    core.finish_task(processor, cycle_time)
+                elif outcome == "TTL Expired":
+                    core.expire_task(processor.name, cycle_time)
+                else:
+                    core.requeue_task(task_queue, processor.name, cycle_time)
+            profiler.stop('execute.run', started)
+            profiler.count('execute.cycles')
+
+            if not self.has_pending_tasks():
+                self.report_completion()
+                break
+            if self.checkpointer is not None and self.checkpointer.due(cycle_time):
+                self.checkpointer.save(self)
+
+    # Пакетный режим: состояние задач хранится в NumPy-массивах (BatchExecutor),
+    # квант продвигается для всех ядер за одну векторную операцию. Результаты тактов копятся блоками
+    # и учитываются массивами (счетчики через np.bincount, статистика и файлы времени выполнения через
+    # record_many); по задачам результаты разбираются, только когда нужны сообщения о каждой задаче
+    # (эхо-ответы, логи уровня INFO и подробнее) или временная шкала
+    def execute_batch(self, merge_size=65536):
+        if self.streaming:
+            raise ValueError('Batch mode requires the whole task table and does not support streaming')
+        if self.scheduler != 'round_robin':
+            raise ValueError('Batch mode supports only round_robin scheduling')
+        if self.data_channel.pipelined or self.allocator is not None:
+            raise ValueError('Batch mode requires all tasks in the queue and supports neither pipelined '
+                             'transmission nor the memory model')
+        per_task = (self.log_writer.echo_enabled or self.log_writer.enabled_for(INFO)
+                    or self.timeline is not None)
+        table = self.memory.tasks
+        cores = [(core.processor, core) for core in self.cores()]
+        executor = BatchExecutor(table, self.task_queue.drain_indices(), len(cores))
+        merge = None if per_task else BatchMerge(self, cores)
+        profiler = self.profiler
+        while not executor.empty():
+            self.cycle_time += 1
+            started = profiler.start('execute.dispatch')
+            index, outcome, remaining = executor.step(self.cycle_time, self.time_quantum)
+            profiler.stop('execute.dispatch', started)
+            started = profiler.start('execute.run')
+            if merge is not None:
+                merge.add(index, outcome, self.cycle_time)
+                if merge.size >= merge_size:
+                    merge.flush()
+            else:
+                self.run_batch_tasks(cores, index, outcome, remaining)
+            profiler.stop('execute.run', started)
+            profiler.count('execute.cycles')
+            if executor.empty():
+                if merge is not None:
+                    merge.flush()
+                self.report_completion()
+                break
+            if self.checkpointer is not None and self.checkpointer.due(self.cycle_time):
+                if merge is not None:
+                    merge.flush()
+                self.checkpointer.save(self, executor.queued_indices())
+
+    # Учет результатов такта пакетного режима по задачам в объектах процессоров и ядер
+    # в порядке обхода ядер, с сообщениями о каждой задаче
+    def run_batch_tasks(self, cores, index, outcome, remaining):
+        table = self.memory.tasks
+        if self.log_writer.enabled_for(DEBUG):
+            for position, task_index in enumerate(index.tolist()):
+                processor, core = cores[position]
+                self.print_proc_logs(processor.name, f"Task {table.row(task_index).name} assigned to Core {core.name}.",
+                                     self.cycle_time)
+        for position, (task_index, task_outcome) in enumerate(zip(index.tolist(), outcome.tolist())):
+            processor, core = cores[position]
+            task = table.row(task_index)
+            core.current_task = task
+            core.status = task
+            core.log_execution(processor.name, self.cycle_time, remaining[position])
+            if task_outcome == COMPLETED:
+                core.finish_task(processor, self.cycle_time)
+            elif task_outcome == EXPIRED:
+                core.expire_task(processor.name, self.cycle_time)
+            else:
+                self.profiler.count('tasks.requeued')
+                if self.timeline is not None:
+                    self.timeline.record(core, task.name, self.cycle_time, REQUEUED)
+                self.echo_task_requeue(task, processor.name, self.cycle_time)
+                task.status = "In queue"
+                core.status = None
+                core.current_task = None
+
+    # Параметры запуска, которые должны совпадать при восстановлении из контрольной точки
+    def checkpoint_settings(self):
+        return {'seed': self.memory.seed, 'time_quantum': self.time_quantum, 'scheduler': self.scheduler,
+                'packing': self.data_channel.packing,
+                'task_types': list(self.memory.task_types), 'num_tasks': len(self.memory.tasks),
+                'cores': [len(processor.cores) for processor in self.processors],
+                'channels': self.data_channel.channels, 'in_flight': self.data_channel.in_flight,
+                'link_latency': self.data_channel.link_latency, 'pipelined': self.data_channel.pipelined,
+                'memory_size': self.memory.size, 'memory_model': self.allocator is not None}
+
+    # Состояние симуляции между тактами для контрольной точки. Квант выполняется целиком в такте
+    # назначения, поэтому между тактами все ядра свободны и состояние - это таблица задач, порядок
+    # очереди, счетчики, статистика и позиции в выходных файлах. queued_indices - очередь пакетного
+    # исполнителя (в пакетном режиме задачи находятся в нем, а не в self.task_queue)
+    def checkpoint_state(self, queued_indices=None):
+        table = self.memory.tasks
+        if queued_indices is not None:
+            queue = {'indices': queued_indices}
+        elif isinstance(self.task_queue, TaskQueue):
+            queue = {'indices': self.task_queue.indices()}
+        else:
+            heap = self.task_queue.heap
+            queue = {'keys': np.array([entry[0] for entry in heap], dtype=np.int64),
+                     'sequences': np.array([entry[1] for entry in heap], dtype=np.int64),
+                     'indices': np.array([entry[2].index for entry in heap], dtype=np.int64),
+                     'sequence': self.task_queue.sequence}
+
+        return {
+            'version': CHECKPOINT_VERSION,
+            'settings': self.checkpoint_settings(),
+            'cycle_time': self.cycle_time,
+            'setup_cycles': self.setup_cycles,
+            'counter': self.counter,
+            'completed_tasks': self.completed_tasks,
+            'table': table.snapshot(),
+            'queue': queue,
+            'arrival_position': self.arrival_position,
+            'processors': [{
+                'completed_tasks': processor.completed_tasks,
+                'completed_by_type': dict(processor.completed_by_type),
+                'cores': [{
+                    'completed_tasks': core.completed_tasks,
+                    'completed_by_type': dict(core.completed_by_type),
+                    'expired_tasks': core.expired_tasks,
+                } for core in processor.cores],
+            } for processor in self.processors],
+            'stats': self.stats.copy(),
+            'clock': {'memory_latency': self.clock.memory_latency, 'transfer_time': self.clock.transfer_time},
+            'delay_rng': self.delay_rng.bit_generator.state,
+            'frames': self.frames_checkpoint(),
+            # Порядок и такты поступления задач (конвейерная передача, модель памяти); после передачи
+            # не меняются, поэтому передаются без копирования
+            'arrivals': {'indices': self.arrival_indices, 'cycles': self.arrival_cycles},
+            'packing_report': dict(self.data_channel.packing_report),
+            'recorder': self.recorder.checkpoint(),
+            'logs': self.log_writer.checkpoint(),
+            'timeline': self.timeline.checkpoint() if self.timeline is not None else None,
+            'allocator': self.allocator.checkpoint() if self.allocator is not None else None,
+        }
+
+    # Фреймы для контрольной точки. После передачи фреймы не меняются, поэтому массивы
+    # собираются один раз за запуск
+    def frames_checkpoint(self):
+        if self.frames_state is None:
+            frame_indices = [np.frombuffer(frame.task_indices, dtype=np.int64) for frame in self.ethernet_frames]
+            self.frames_state = {
+                'indices': np.concatenate(frame_indices) if frame_indices else np.empty(0, dtype=np.int64),
+                'lengths': np.array([len(indices) for indices in frame_indices], dtype=np.int64),
+                'occupied_space': np.array([frame.occupied_space for frame in self.ethernet_frames], dtype=np.int64),
+                'fill': np.array([frame.frame_fill_percentage for frame in self.ethernet_frames], dtype=np.float64)}
+        return self.frames_state
+
+    # Восстанавливает состояние из контрольной точки (см. checkpoint_state); выполнение
+    # продолжается со следующего такта, итоги совпадают с непрерванным запуском
+    def restore_state(self, state):
+        if self.streaming:
+            raise ValueError('Checkpoints require the whole task table and do not support streaming')
+        if state['settings']['seed'] is None:
+            raise ValueError('Checkpoint was made without a seed: the workload of the interrupted run cannot be '
+                             'regenerated, start the run with a seed to resume it')
+        if state['settings'] != self.checkpoint_settings():
+            raise ValueError(f"Checkpoint was made with different settings: {state['settings']}")
+        table = self.memory.tasks
+        for column, values in state['table'].items():
+            setattr(table, column, values)
+        queue = state['queue']
+        if 'keys' in queue:
+            self.task_queue = make_task_queue(self.scheduler, self.time_quantum)
+            self.task_queue.heap = [(key, sequence, table.row(index)) for key, sequence, index in
+                                    zip(queue['keys'].tolist(), queue['sequences'].tolist(), queue['indices'].tolist())]
+            self.task_queue.sequence = queue['sequence']
+        else:
+            self.task_queue = TaskQueue(table, capacity=len(table))
+            self.task_queue.put_indices(queue['indices'])
+        self.arrival_indices = state['arrivals']['indices']
+        self.arrival_cycles = state['arrivals']['cycles']
+        self.arrivals_count = len(self.arrival_indices) if self.arrival_indices is not None else 0
+        self.arrival_position = state['arrival_position']
+
+        for processor, processor_state in zip(self.processors, state['processors']):
+            processor.completed_tasks = processor_state['completed_tasks']
+            processor.completed_by_type = dict(processor_state['completed_by_type'])
+            for core, core_state in zip(processor.cores, processor_state['cores']):
+                core.completed_tasks = core_state['completed_tasks']
+                core.completed_by_type = dict(core_state['completed_by_type'])
+                core.expired_tasks = core_state['expired_tasks']
+        self.stats = state['stats']
+        self.clock.memory_latency = state['clock']['memory_latency']
+        self.clock.transfer_time = state['clock']['transfer_time']
+        self.delay_rng.bit_generator.state = state['delay_rng']
+        frames = state['frames']
+        self.ethernet_frames = []
+        for indices, occupied_space, fill in zip(np.split(frames['indices'], np.cumsum(frames['lengths'])[:-1]),
+                                                 frames['occupied_space'].tolist(), frames['fill'].tolist()):
+            frame = Frame(table)
+            frame.task_indices = array('q', indices.tobytes())
+            frame.occupied_space = occupied_space
+            frame.frame_fill_percentage = fill
+            self.ethernet_frames.append(frame)
+        self.data_channel.frames = self.ethernet_frames
+        self.frames_state = frames
+        self.data_channel.packing_report = dict(state['packing_report'])
+        self.recorder.resume(state['recorder'])
+        self.log_writer.resume(state['logs'])
+        if self.timeline is not None and state['timeline'] is not None:
+            self.timeline.resume(state['timeline'])
+        if self.allocator is not None:
+            self.allocator.resume(state['allocator'], table)
+        self.cycle_time = state['cycle_time']
+        self.setup_cycles = state['setup_cycles']
+        self.counter = state['counter']
+        self.completed_tasks = state['completed_tasks']
+
+    # Все ядра системы в порядке процессоров и ядер
+    def cores(self):
+        return [core for processor in self.processors for core in processor.cores]
+
+    def report_completion(self):
+        # Если очередь задач пуста, логирует завершение работы
+        self.print_system_logs("All tasks completed. Ending execution.", self.cycle_time)
+        self.report("All tasks completed. Ending execution.")
+        for processor in self.processors:
+            self.report(f'Processor {processor.name} completed {processor.completed_tasks} in {self.cycle_time/processor.clock_speed} seconds')
+        self.report(f'Memory latency: {self.clock.memory_latency:.9f} seconds. '
+                    f'Transfer time: {self.clock.transfer_time:.9f} seconds.')
+        if self.clock.virtual:
+            execution_cycles = self.cycle_time - self.setup_cycles
+            setup = 'first frame' if self.streaming else 'pipelined, memory only' if self.data_channel.pipelined \
+                else 'memory and transfer'
+            self.report(f'Setup ({setup}): {self.setup_cycles} cycles, execution: {execution_cycles} cycles, '
+                        f'total: {self.cycle_time / Processor.clock_speed} seconds (virtual time)')
+
+    # Печатает итоговое сообщение, если вывод на экран включен
+    def report(self, message):
+        if self.verbose:
+            print(message)
+
+    # Имитирует задержку взаимодействия с памятью для count задач
+    def simulate_time_delay(self, count=1):
+        started = self.profiler.start('delay.memory')
+        delay = 0
+        for chunk_start in range(0, count, 1 << 20): # Генерирует задержки блоками, чтобы не выделять большой массив
+            delay += self.delay_rng.uniform(self.delay_start, self.delay_end, min(1 << 20, count - chunk_start)).sum()
+        self.clock.delay(float(delay), 'memory')
+        self.profiler.stop('delay.memory', started)
+
+    # Записывает сообщение в лог конкретного процессора
+    def print_proc_logs(self, processor_name, log, cycle_time):
+        # Конвертирует такты процессора в секунды и добавляет запись в буфер файла процессора
+        self.log_writer.write(f"{processor_name}_log.txt", cycle_time / Processor.clock_speed, log, DEBUG)
+
+    # Записывает сообщение в общий системный лог
+    def print_system_logs(self, log, cycle_time, level=INFO):
+        # Конвертирует такты процессора в секунды и добавляет запись в буфер системного лога
+        self.log_writer.write("SystemLOG.txt", cycle_time / Processor.clock_speed, log, level)
+
+    def echo_task_requeue(self, task, processor_name, cycle_time):
+        if not self.log_writer.echo_enabled and not self.log_writer.enabled_for(INFO):
+            return # Сообщение не выводится и не записывается
+        log_message = f"Echo: Task {task.name} requeued at {cycle_time} from Processor {processor_name}."
+        self.log_writer.echo(log_message)  # Вывод эхо-ответа на экран
+        self.print_system_logs(log_message, cycle_time)  # Логирует в системный лог
+
+    # Логирует эхо-ответы при завершении задачи
+    def echo_task_completion(self, task, processor_name, core_name, cycle_time):
+        if not self.log_writer.echo_enabled and not self.log_writer.enabled_for(INFO):
+            return # Сообщение не выводится и не записывается
+        log_message = f"Echo: Task {task.name} completed by {core_name} of Processor {processor_name}."
+        self.log_writer.echo(log_message)  # Вывод эхо-ответа на экран
+        self.print_system_logs(log_message, cycle_time)  # Логирует в системный лог
+
+    # Логирует эхо-ответы при истечении TTL задачи
+    def echo_task_ttl_expired(self, task, processor_name, core_name, cycle_time):
+        if not self.log_writer.echo_enabled and not self.log_writer.enabled_for(INFO):
+            return # Сообщение не выводится и не записывается
+        log_message = f"Echo: Task {task.name} TTL expired on {core_name} of Processor {processor_name}."
+        self.log_writer.echo(log_message)  # Вывод эхо-ответа на экран
+        self.print_system_logs(log_message, cycle_time)  # Логирует в системный лог
+
+    # Логирует текущее состояние всех задач в памяти
+    def log_all_tasks_state(self, cycle_time):
+        if not self.log_writer.enabled_for(TRACE) or self.memory.tasks is None:
+            return
+        # Формирует список состояния задач (имя задачи и статус)
+        task_state = [(task.name, task.status) for task in self.memory.tasks]
+        # Формирует сообщение о состоянии задач
+        log_message = f"All Tasks State at Time {cycle_time / Processor.clock_speed:.9f}s: {task_state}"
+        # Записывает в системный лог
+        self.print_system_logs(log_message, cycle_time, TRACE)
+
+
+# Учет результатов тактов пакетного режима без разбора по задачам: исходы копятся блоками
+# и переносятся массивами в счетчики ядер и процессоров, статистику и файлы времени выполнения.
+# Записи о выполненных задачах идут в порядке (такт, ядро), как при учете по задачам
+class BatchMerge:
+    def __init__(self, simulation, cores):
+        self.simulation = simulation
+        self.cores = cores # Пары (процессор, ядро) в порядке обхода ядер
+        table = simulation.memory.tasks
+        self.task_types = table.task_types
+        recorder = simulation.recorder
+        self.recorder_indices = np.array([recorder.register(processor.name, core.name) for processor, core in cores],
+                                         dtype=np.int32).reshape(-1, 2)
+        # Коды типов таблицы задач -> индексы типов в файлах времени выполнения
+        self.recorder_types = np.array([recorder.register_type(task_type) for task_type in table.task_types],
+                                       dtype=np.int8)
+        # Ключи рядов статистики: номер ключа - номер ядра * количество типов + код типа
+        self.keys = [(processor.name, core.name, task_type) for processor, core in cores for task_type in table.task_types]
+        # Коды статусов задач по кодам исходов COMPLETED, EXPIRED, REQUEUED
+        self.statuses = np.array([STATUS_CODES['Completed'], STATUS_CODES['TTL Expired'], STATUS_CODES['In queue']],
+                                 dtype=table.status.dtype)
+        self.blocks = [] # (индексы задач по ядрам, исходы, такт)
+        self.size = 0 # Количество исходов в блоках
+
+    # Добавляет исходы одного такта; статусы задач в таблице обновляются сразу
+    def add(self, index, outcome, cycle_time):
+        self.simulation.memory.tasks.status[index] = self.statuses[outcome]
+        self.blocks.append((index, outcome, cycle_time))
+        self.size += len(index)
+
+    # Переносит накопленные исходы в счетчики, статистику и файлы времени выполнения
+    def flush(self):
+        if not self.blocks:
+            return
+        simulation = self.simulation
+        profiler = simulation.profiler
+        started = profiler.start('execute.merge')
+        table = simulation.memory.tasks
+        blocks, self.blocks, self.size = self.blocks, [], 0
+        lengths = [len(index) for index, _, _ in blocks]
+        index = np.concatenate([index for index, _, _ in blocks])
+        outcome = np.concatenate([outcome for _, outcome, _ in blocks])
+        positions = np.concatenate([np.arange(length) for length in lengths]) # Номера ядер
+        cycles = np.repeat([cycle_time for _, _, cycle_time in blocks], lengths)
+        completed = outcome == COMPLETED
+        task_index = index[completed]
+        core_position = positions[completed]
+        start = table.start_time[task_index]
+        end = cycles[completed]
+        types = table.type[task_index].astype(np.int64)
+        codes = core_position * len(self.task_types) + types
+        by_type = np.bincount(codes, minlength=len(self.keys)).reshape(len(self.cores), len(self.task_types)).tolist()
+        expired = np.bincount(positions[outcome == EXPIRED], minlength=len(self.cores)).tolist()
+        for (processor, core), type_counts, expired_count in zip(self.cores, by_type, expired):
+            for task_type, count in zip(self.task_types, type_counts):
+                if count:
+                    core.completed_tasks += count
+                    processor.completed_tasks += count
+                    core.completed_by_type[task_type] = core.completed_by_type.get(task_type, 0) + count
+                    processor.completed_by_type[task_type] = processor.completed_by_type.get(task_type, 0) + count
+            core.expired_tasks += expired_count
+        simulation.counter += len(task_index)
+        simulation.stats.record_many(end - start, codes, self.keys)
+        simulation.recorder.record_many(table.name[task_index], start, end, self.recorder_indices[core_position, 0],
+                                        self.recorder_indices[core_position, 1], self.recorder_types[types])
+        profiler.count('tasks.completed', len(task_index))
+        profiler.count('tasks.expired', sum(expired))
+        profiler.count('tasks.requeued', len(outcome) - len(task_index) - sum(expired))
+        profiler.stop('execute.merge', started)
+
+
+# Класс, представляющий процессор с несколькими ядрами
+class Processor:
+    clock_speed = 1 * (10 ** 9)  # Частота процессора в герцах (1 ГГц)
+
+    def __init__(self, name, num_cores, simulation=None):
+        self.name = name # Имя процессора
+        self.simulation = simulation # Запуск симуляции, которому принадлежит процессор
+        # Создает список ядер с уникальными именами
+        self.cores = [Core(name=f'Core-{i}', processor=self) for i in range(num_cores)]
+        self.completed_tasks = 0
+        self.completed_by_type = {} # Количество выполненных задач по типам
+
+    def increment_completed_tasks(self):
+        self.completed_tasks += 1
+
+    def __str__(self):
+        return self.name  # Возвращает имя процессора как строку
+
+
+# Класс, представляющий ядро процессора
+class Core:
+    def __init__(self, name, processor=None):
+        self.status = None # Статус ядра: None, если свободно
+        self.name = name # Имя ядра
+        self.processor = processor # Процессор, которому принадлежит ядро
+        self.current_task = None # Текущая задача, выполняемая на ядре
+        self.start_time = None # Время начала выполнения задачи
+        self.end_time = None # Время окончания выполнения задачи
+        self.expired_tasks = 0 # Количество задач с истекшим TTL
+        self.completed_tasks = 0
+        self.completed_by_type = {} # Количество выполненных задач по типам
+
+
+    # Выполняет задачу с учетом временного кванта
+    def execute_task(self, time_quantum, processor_name, task_queue, completed_tasks, cycle_time):
+        if self.current_task:
+            self.log_execution(processor_name, cycle_time) # Логирует выполнение задачи
+
+            for _ in range(time_quantum):  # Выполняет задачу в рамках временного кванта
+                if self.current_task.remaining_operations > 0 and self.current_task.ttl > 0:
+                    self.current_task.run()  # Уменьшает оставшиеся операции задачи
+                    self.current_task.ttl -= 1  # Уменьшает TTL
+                    self.current_task.status = 'In work'  # Обновляет статус задачи
+
+                if self.current_task.remaining_operations <= 0:
+                    # Задача завершена
+                    self.finish_task(self.processor, cycle_time)
+                    completed_tasks += 1  # Увеличивает счетчик завершенных задач
+                    return
+
+                if self.current_task.ttl <= 0:
+                    # TTL задачи истек
+                    self.expire_task(processor_name, cycle_time)
+                    return
+
+            # Если задача не завершена за временной квант
+            if self.current_task and self.current_task.remaining_operations > 0:
+                self.requeue_task(task_queue, processor_name, cycle_time)
+
+    # Логирует выполнение текущей задачи на ядре
+    def log_execution(self, processor_name, cycle_time, remaining_operations=None):
+        if not self.processor.simulation.log_writer.enabled_for(DEBUG):
+            return
+        if remaining_operations is None:
+            remaining_operations = self.current_task.remaining_operations
+        log_message = f"Core {self.name} is executing Task {self.current_task.name}. Remaining operations: {remaining_operations}."
+        self.processor.simulation.print_proc_logs(processor_name, log_message, cycle_time)
+
+    # Фиксирует завершение задачи на ядре и освобождает ядро
+    def finish_task(self, processor, cycle_time):
+        simulation = processor.simulation
+        profiler = simulation.profiler
+        started = profiler.start('tasks.finish')
+        profiler.count('tasks.completed')
+        simulation.counter += 1
+        task = self.current_task
+        if simulation.timeline is not None:
+            simulation.timeline.record(self, task.name, cycle_time, COMPLETED)
+        self.completed_tasks += 1
+        processor.increment_completed_tasks()
+        task_type = task.task_type
+        processor.completed_by_type[task_type] = processor.completed_by_type.get(task_type, 0) + 1
+        self.completed_by_type[task_type] = self.completed_by_type.get(task_type, 0) + 1
+        simulation.echo_task_completion(task, processor.name, self.name, cycle_time)
+        self.end_time = cycle_time  # Фиксирует время окончания
+        task.status = 'Completed'  # Обновляет статус задачи
+        self.record_task_time(processor.name, task_type)  # Сохраняет статистику выполнения задачи
+        simulation.release_task_memory(task)
+        if simulation.log_writer.enabled_for(DEBUG):
+            log_message = f"Task {task.name} completed successfully on Core {self.name} of Processor {processor.name}."
+            simulation.print_proc_logs(processor.name, log_message, cycle_time)
+        self.status = None  # Освобождает ядро
+        self.current_task = None
+        profiler.stop('tasks.finish', started)
+
+    # Фиксирует истечение TTL задачи и освобождает ядро
+    def expire_task(self, processor_name, cycle_time):
+        self.current_task.status = "TTL Expired"
+        self.processor.simulation.profiler.count('tasks.expired')
+        if self.processor.simulation.timeline is not None:
+            self.processor.simulation.timeline.record(self, self.current_task.name, cycle_time, EXPIRED)
+        self.processor.simulation.echo_task_ttl_expired(self.current_task, processor_name, self.name, cycle_time)
+        self.expired_tasks += 1
+        self.processor.simulation.release_task_memory(self.current_task)
+        if self.processor.simulation.log_writer.enabled_for(DEBUG):
+            log_message = f"Task {self.current_task.name} expired on Core {self.name} of Processor {processor_name}."
+            self.processor.simulation.print_proc_logs(processor_name, log_message, cycle_time)
+        self.status = None  # Освобождаем ядро
+        self.current_task = None
+
+    # Возвращает незавершенную за квант задачу в очередь и освобождает ядро
+    def requeue_task(self, task_queue, processor_name, cycle_time):
+        task_queue.put(self.current_task)  # Возвращаем задачу в очередь
+        self.processor.simulation.profiler.count('tasks.requeued')
+        if self.processor.simulation.timeline is not None:
+            self.processor.simulation.timeline.record(self, self.current_task.name, cycle_time, REQUEUED)
+        self.processor.simulation.echo_task_requeue(self.current_task, processor_name, cycle_time)
+        self.current_task.status = "In queue"  # Обновляем статус задачи
+        self.status = None  # Освобождаем ядро
+        self.current_task = None
+
+    # Назначает задачу ядру
+    def assign_task(self, task, cycle_time):
+        if self.status is None: # Если ядро свободно
+            if task.start_time is None:
+                task.start_time = cycle_time # Фиксирует время начала выполнения задачи
+            self.current_task = task # Привязывает задачу к ядру
+            self.status = task # Обновляет статус ядра
+            self.current_task.status = "In work" # Изменяет статус задачи
+            return True
+        return False # Возвращает False, если ядро занято
+
+    # Записывает информацию о времени выполнения задачи в накопитель (сбрасывается в файлы блоками)
+    def record_task_time(self, processor_name, task_type):
+        simulation = self.processor.simulation
+        task = self.current_task
+        start_time = task.start_time
+        simulation.stats.record(self.end_time - start_time, processor_name, self.name, task_type)
+        simulation.recorder.record(task.name, start_time, self.end_time, processor_name, self.name, task_type)
+
+
+# Класс памяти, содержащий задачи
+# workload_cache - каталог кэша сгенерированных нагрузок (workload_cache.py): нагрузка с теми же
+# настройками типов задач, количеством задач и зерном читается из него, а не генерируется заново
+class Memory:
+    def __init__(self, config, num_tasks, simulation, seed=None, streaming=False, trace=None, size=None,
+                 workload_cache=None):
+        self.config = config
+        self.simulation = simulation # Запуск симуляции, которому принадлежит память
+        self.trace = trace # Путь к трассе задач (None - задачи генерируются)
+        self.num_tasks = num_tasks
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.workload_cache = None
+        if workload_cache is not None and trace is None and num_tasks:
+            if seed is None:
+                raise ValueError('Workload cache requires a seed')
+            self.workload_cache = WorkloadCache(workload_cache)
+        self.size = MEMORY_SIZE if size is None else size # Объем памяти в битах
+        self.task_types = list(config.keys()) # Типы задач в порядке конфигурации
+        self.tasks = None
+        if not streaming:
+            records = self.load_cached()
+            if records is not None:
+                with self.simulation.profiler.timer('memory.cache_load'):
+                    self.tasks = records_to_table(config, records)
+            else:
+                # Генерирует все задачи векторно в компактную таблицу
+                with self.simulation.profiler.timer('memory.generate'):
+                    self.tasks = TaskTable.generate(config, num_tasks, self.rng)
+                if self.workload_cache is not None:
+                    writer = self.workload_cache.writer(config, num_tasks, seed)
+                    writer.write(self.tasks)
+                    writer.commit()
+            self.simulation.simulate_time_delay(num_tasks)
+            self.simulation.report(f"{num_tasks} tasks created ({self.tasks.nbytes()} bytes in memory).")
+
+    # Записи нагрузки из кэша (None - кэш не задан или нагрузки в нем нет)
+    def load_cached(self, chunk_size=None):
+        if self.workload_cache is None:
+            return None
+        records = self.workload_cache.load(self.config, self.num_tasks, self.seed, chunk_size)
+        self.simulation.profiler.count('memory.cache_hits' if records is not None else 'memory.cache_misses')
+        if records is not None:
+            self.simulation.report(f"Workload loaded from cache {self.workload_cache.directory}.")
+        return records
+
+    # Лениво генерирует задачи частями по chunk_size штук (для потокового режима).
+    # При заданной трассе читает задачи из нее, при заданном кэше нагрузок - части из кэша
+    def stream_tasks(self, chunk_size=65536):
+        if self.trace is not None:
+            for table in load_trace(self.trace, self.task_types, chunk_size):
+                self.simulation.simulate_time_delay(len(table))
+                yield table
+            return
+        records = self.load_cached(chunk_size)
+        writer = None
+        if records is None and self.workload_cache is not None:
+            writer = self.workload_cache.writer(self.config, self.num_tasks, self.seed, chunk_size)
+        for first_name in range(0, self.num_tasks, chunk_size):
+            count = min(chunk_size, self.num_tasks - first_name)
+            if records is not None:
+                with self.simulation.profiler.timer('memory.cache_load'):
+                    table = records_to_table(self.config, records[first_name:first_name + count], first_name)
+            else:
+                with self.simulation.profiler.timer('memory.generate'):
+                    table = TaskTable.generate(self.config, count, self.rng)
+                table.name += first_name
+                if writer is not None:
+                    writer.write(table)
+            self.simulation.simulate_time_delay(count)
+            yield table
+        if writer is not None:
+            writer.commit()
+
+
+# Основной блок программы
+
+
+# Итоги одного запуска симуляции
+class Results:
+    def __init__(self, round_robin):
+        self.round_robin = round_robin
+        self.processors = round_robin.processors # Процессоры и ядра со счетчиками (для диаграмм)
+        self.ethernet_frames = round_robin.ethernet_frames
+        self.stats = round_robin.stats # Статистика времени выполнения задач (stats/statistics.py)
+        self.stats.flush()
+        self.completed_tasks = round_robin.counter # Количество выполненных задач
+        # Выполненные задачи по процессорам и типам, задачи с истекшим TTL по ядрам
+        self.completed_by_processor = {processor.name: processor.completed_tasks for processor in self.processors}
+        self.completed_by_type = {processor.name: dict(processor.completed_by_type) for processor in self.processors}
+        self.expired_by_core = {(processor.name, core.name): core.expired_tasks
+                                for processor in self.processors for core in processor.cores}
+        self.expired_tasks = sum(self.expired_by_core.values())
+        self.cycle_time = round_robin.cycle_time
+        self.setup_cycles = round_robin.setup_cycles
+        self.execution_cycles = round_robin.cycle_time - round_robin.setup_cycles
+        self.packing_report = dict(round_robin.data_channel.packing_report)
+        self.memory_latency = round_robin.clock.memory_latency
+        self.transfer_time = round_robin.clock.transfer_time
+        # Ожидание задач до начала выполнения в тактах (от поступления в систему, включая подготовку
+        # данных и передачу); в потоковом режиме таблица задач не хранится и ожидание не считается
+        self.mean_wait_cycles = None
+        self.max_wait_cycles = None
+        if not round_robin.streaming:
+            table = round_robin.memory.tasks
+            started = table.start_time >= 0
+            wait = table.start_time[started] - table.arrival_time[started]
+            if len(wait):
+                self.mean_wait_cycles = float(wait.mean())
+                self.max_wait_cycles = int(wait.max())
+        # Занятость памяти (None, если модель памяти выключена, см. MemoryAllocator.report)
+        self.memory = round_robin.allocator.report() if round_robin.allocator is not None else None
+        # Сводка замеров фаз (None, если профилирование выключено)
+        self.profile = round_robin.profiler.summary() if round_robin.profiler.enabled else None
+
+
+# Параметры запуска по умолчанию. task_types - настройки типов задач (как в get_user_config),
+# log_level и echo - уровень логов и вывод эхо-ответов, log_files - создавать ли файлы логов,
+# csv_path и binary_dir - файлы времени выполнения задач (None - не записывать),
+# profile - замеры времени фаз, profile_sample - измерять каждый N-й вызов таймера,
+# profile_path - JSON-файл для сводки замеров (None - не записывать),
+# checkpoint_path и checkpoint_interval - файл и период (в тактах) контрольных точек (None - без них),
+# resume - продолжить с контрольной точки checkpoint_path, если она есть (параметры должны совпадать),
+# timeline_dir - каталог временной шкалы занятости ядер (None - не записывать, см. timeline.py),
+# channels, in_flight и link_latency - параллельные каналы, наибольшее количество фреймов в пути
+# и задержка распространения (сек), pipelined - выполнять задачи по мере прихода фреймов (см. DataChannel),
+# memory_size - объем памяти в битах, memory_model - размещать задачи в памяти при поступлении и откладывать
+# поступление при нехватке памяти, memory_sample_interval - период замеров занятости памяти в тактах,
+# workload_cache - каталог кэша сгенерированных нагрузок (None - без кэша; нужен seed, см. workload_cache.py)
+DEFAULT_CONFIG = {
+    'time_quantum': 10,
+    'processors_count': 4,
+    'num_cores': 8,
+    'num_tasks': 1000,
+    'task_types': {
+        'Cycling': {'ttl': 100, 'tick_range': (10, 50), 'size_range': (1, 20)},
+        'Periodic': {'ttl': 60, 'tick_range': (5, 20), 'size_range': (1, 10)},
+        'Impulse': {'ttl': 20, 'tick_range': (1, 5), 'size_range': (1, 5)},
+    },
+    'mode': 'event',
+    'streaming': False,
+    'buffer_size': 1024,
+    'packing': 'next_fit',
+    'scheduler': 'round_robin',
+    'trace': None,
+    'seed': None,
+    'delay_range': (0.0, 0.0),
+    'virtual': True,
+    'log_level': 'WARNING',
+    'echo': False,
+    'log_files': False,
+    'csv_path': None,
+    'binary_dir': None,
+    'verbose': False,
+    'profile': False,
+    'profile_sample': 1,
+    'profile_path': None,
+    'checkpoint_path': None,
+    'checkpoint_interval': 100000,
+    'resume': False,
+    'timeline_dir': None,
+    'channels': 1,
+    'in_flight': None,
+    'link_latency': 0.0,
+    'pipelined': False,
+    'memory_size': MEMORY_SIZE,
+    'memory_model': False,
+    'memory_sample_interval': 1000,
+    'workload_cache': None,
+}
+
+
+# Выполняет один запуск симуляции с параметрами config (недостающие берутся из DEFAULT_CONFIG)
+# и возвращает его итоги. Состояние запуска не хранится в модуле, поэтому запуски независимы
+def simulate(config):
+    config = dict(DEFAULT_CONFIG, **config)
+    profiler = Profiler(enabled=config['profile'], sample_every=config['profile_sample'])
+    log_writer = LogWriter(level=LEVELS[config['log_level']], echo=config['echo'], profiler=profiler)
+    recorder = TaskTimeRecorder(csv_path=config['csv_path'], binary_dir=config['binary_dir'], profiler=profiler)
+    checkpointer = None
+    if config['checkpoint_path']:
+        checkpointer = Checkpointer(config['checkpoint_path'], config['checkpoint_interval'])
+    state = None
+    if config['resume'] and config['checkpoint_path'] and os.path.exists(config['checkpoint_path']):
+        state = load_checkpoint(config['checkpoint_path'])
+    try:
+        # При продолжении с контрольной точки файлы логов и времени выполнения не очищаются,
+        # а обрезаются до ее позиций (см. restore_state)
+        if config['log_files'] and state is None:
+            initialize_logs(log_writer, config['processors_count'])
+        if state is None:
+            recorder.start()
+        started = profiler.start('simulate.setup')
+        round_robin = RoundRobin(config['time_quantum'], config['processors_count'], config['task_types'],
+                                 config['num_tasks'], num_cores=config['num_cores'], streaming=config['streaming'],
+                                 buffer_size=config['buffer_size'], packing=config['packing'], seed=config['seed'],
+                                 trace=config['trace'], scheduler=config['scheduler'],
+                                 clock=SimulationClock(virtual=config['virtual']), log_writer=log_writer,
+                                 recorder=recorder, delay_range=config['delay_range'], verbose=config['verbose'],
+                                 profiler=profiler, checkpointer=checkpointer, timeline_dir=config['timeline_dir'],
+                                 channels=config['channels'], in_flight=config['in_flight'],
+                                 link_latency=config['link_latency'], pipelined=config['pipelined'],
+                                 memory_size=config['memory_size'], memory_model=config['memory_model'],
+                                 memory_sample_interval=config['memory_sample_interval'],
+                                 workload_cache=config['workload_cache'])
+        if state is not None:
+            round_robin.restore_state(state)
+        profiler.stop('simulate.setup', started)
+        with profiler.timer('simulate.execute'):
+            round_robin.execute(config['mode'])
+        if round_robin.timeline is not None:
+            with profiler.timer('io.timeline_close'):
+                round_robin.timeline.close()
+    finally:
+        if checkpointer is not None:
+            checkpointer.close() # Дожидается записи последней контрольной точки
+        with profiler.timer('simulate.close'):
+            log_writer.close() # Сбрасывает оставшиеся записи логов на диск
+            recorder.close() # Сбрасывает оставшиеся записи о времени выполнения задач
+    if checkpointer is not None and os.path.exists(checkpointer.path):
+        os.remove(checkpointer.path) # Запуск завершен, продолжать больше нечего
+    if config['profile_path']:
+        profiler.export(config['profile_path'])
+    return Results(round_robin)
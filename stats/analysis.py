@@ -0,0 +1,173 @@
+import argparse # Для разбора аргументов командной строки
+import csv
+import itertools
+import os
+import numpy as np
+import scipy.stats as stats
+from recorder import load_task_times # Модуль корня проекта; из корня: python -m stats.analysis
+
+PERCENTILES = (50, 95, 99)
+ALPHA = 0.05 # Уровень значимости критерия хи-квадрат
+
+
+# Коды значений values в списке имен names; новые имена добавляются в порядке первого появления
+# (как в TaskTimeRecorder), поэтому коды согласованы между частями файла
+def encode(values, names, codes):
+    unique, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+    for value in unique[np.argsort(first, kind='stable')].tolist():
+        if value not in codes:
+            codes[value] = len(names)
+            names.append(value)
+    mapping = np.array([codes[value] for value in unique.tolist()], dtype=np.int32)
+    return mapping[inverse.reshape(-1)]
+
+
+# Столбцы бинарного формата (recorder.load_task_times) из CSV-файла TaskTimeRecorder. Время в файле -
+# в секундах, переводится в такты с частотой clock_speed. Файл читается частями по chunk_size строк:
+# столбцы имен в памяти только для одной части. Читаются оба формата: прежний из 6 столбцов и текущий
+# из 7 (с типом задачи, CSV_HEADER); набор столбцов определяется по заголовку, у файлов прежнего формата
+# нет столбцов type и type_names. processor_names и core_names - имена всей конфигурации: в CSV есть только ядра,
+# выполнившие задачи. CSV разбирается заметно медленнее бинарного формата, для больших запусков
+# лучше binary_dir
+def load_csv(path, clock_speed=10 ** 9, chunk_size=1 << 18, processor_names=(), core_names=()):
+    labels = ('processor', 'core', 'type')
+    parts = {column: [] for column in ('name', 'start', 'end') + labels}
+    names = {'processor': list(processor_names), 'core': list(core_names), 'type': []}
+    codes = {label: {name: code for code, name in enumerate(names[label])} for label in labels}
+    with open(path, newline='', encoding='utf-8') as file:
+        header = next(csv.reader([next(file)]))
+        labels = labels[:len(header) - 4]
+        while True:
+            lines = list(itertools.islice(file, chunk_size))
+            if not lines:
+                break
+            numbers = np.loadtxt(lines, delimiter=',', usecols=(0, 1, 2), ndmin=2)
+            parts['name'].append(numbers[:, 0].astype(np.int64))
+            parts['start'].append(np.rint(numbers[:, 1] * clock_speed).astype(np.int64))
+            parts['end'].append(np.rint(numbers[:, 2] * clock_speed).astype(np.int64))
+            values = np.loadtxt(lines, delimiter=',', usecols=range(4, 4 + len(labels)), dtype=str, ndmin=2)
+            for position, label in enumerate(labels):
+                parts[label].append(encode(values[:, position], names[label], codes[label]))
+    columns = {'clock_speed': clock_speed}
+    for column in ('name', 'start', 'end') + labels:
+        columns[column] = np.concatenate(parts[column]) if parts[column] else \
+            np.empty(0, dtype=np.int64 if column in ('name', 'start', 'end') else np.int32)
+    for label in labels:
+        columns[f'{label}_names'] = names[label]
+    return columns
+
+
+# Столбцы из каталога бинарного формата или из CSV-файла (имена конфигурации - см. load_csv;
+# бинарный формат хранит их сам)
+def load_output(path, clock_speed=10 ** 9, processor_names=(), core_names=()):
+    if os.path.isdir(path):
+        return load_task_times(path)
+    return load_csv(path, clock_speed, processor_names=processor_names, core_names=core_names)
+
+
+# Индекс справедливости Джайна: (сумма x)^2 / (n * сумма x^2); 1 - нагрузка распределена поровну,
+# 1/n - вся нагрузка на одном участнике
+def jain_index(counts):
+    counts = np.asarray(counts, dtype=np.float64)
+    square_sum = float((counts ** 2).sum())
+    return float(counts.sum() ** 2 / (len(counts) * square_sum)) if square_sum else 1.0
+
+
+# Критерий хи-квадрат равномерности распределения задач: статистика, p-значение и вывод
+# (равномерно, если гипотеза не отклоняется на уровне alpha)
+def chi_square_uniform(counts, alpha=ALPHA):
+    counts = np.asarray(counts, dtype=np.float64)
+    if len(counts) < 2 or not counts.sum():
+        return {'statistic': 0.0, 'p_value': 1.0, 'uniform': True}
+    statistic, p_value = stats.chisquare(counts)
+    return {'statistic': float(statistic), 'p_value': float(p_value), 'uniform': bool(p_value >= alpha)}
+
+
+# Сводка количества выполненных задач по участникам: количества, среднее, дисперсия,
+# стандартное отклонение, индекс Джайна и критерий хи-квадрат
+def balance(names, counts, alpha=ALPHA):
+    counts = np.asarray(counts, dtype=np.int64)
+    return {
+        'counts': dict(zip(names, counts.tolist())),
+        'mean': float(counts.mean()) if len(counts) else 0.0,
+        'variance': float(counts.var()) if len(counts) else 0.0,
+        'std': float(counts.std()) if len(counts) else 0.0,
+        'jain_index': jain_index(counts),
+        'chi_square': chi_square_uniform(counts, alpha),
+    }
+
+
+# Распределение времени выполнения (такты от начала до конца) ряда значений
+def latency_summary(cycles, clock_speed):
+    if not len(cycles):
+        return {'count': 0}
+    percentiles = np.percentile(cycles, PERCENTILES)
+    return {
+        'count': len(cycles),
+        'mean_seconds': float(cycles.mean()) / clock_speed,
+        'std_seconds': float(cycles.std()) / clock_speed,
+        'min_seconds': int(cycles.min()) / clock_speed,
+        'max_seconds': int(cycles.max()) / clock_speed,
+        'percentiles_seconds': {q: float(value) / clock_speed for q, value in zip(PERCENTILES, percentiles)},
+    }
+
+
+# Анализ времени выполнения задач: количество выполненных задач по процессорам и ядрам, балансировка
+# нагрузки (индекс Джайна, хи-квадрат) и распределения времени выполнения, всего и по типам задач.
+# Все вычисления - векторные операции над столбцами, без обхода записей
+def analyze(columns, alpha=ALPHA):
+    processor = np.asarray(columns['processor'])
+    core = np.asarray(columns['core'])
+    processor_names = columns['processor_names']
+    core_names = columns['core_names']
+    processor_counts = np.bincount(processor, minlength=len(processor_names))
+    # Ядро определяется парой (процессор, ядро); ядра без выполненных задач учитываются с нулем
+    core_keys = processor.astype(np.int64) * len(core_names) + core
+    core_counts = np.bincount(core_keys, minlength=len(processor_names) * len(core_names))
+    core_labels = list(itertools.product(processor_names, core_names))
+    cycles = np.asarray(columns['end']) - np.asarray(columns['start'])
+    clock_speed = columns['clock_speed']
+    by_type = {}
+    if 'type' in columns:
+        types = np.asarray(columns['type'])
+        for code, task_type in enumerate(columns['type_names']):
+            by_type[task_type] = latency_summary(cycles[types == code], clock_speed)
+    return {
+        'tasks': len(cycles),
+        'processors': balance(processor_names, processor_counts, alpha),
+        'cores': balance(core_labels, core_counts, alpha),
+        'latency': latency_summary(cycles, clock_speed),
+        'latency_by_type': by_type,
+    }
+
+
+def format_latency(summary):
+    if not summary['count']:
+        return 'no tasks'
+    percentiles = ', '.join(f"p{q} {value:.9f}" for q, value in summary['percentiles_seconds'].items())
+    return (f"{summary['count']} tasks, mean {summary['mean_seconds']:.9f} s, std {summary['std_seconds']:.9f} s, "
+            f"min {summary['min_seconds']:.9f} s, max {summary['max_seconds']:.9f} s, {percentiles}")
+
+
+def print_report(report):
+    print(f"Completed tasks: {report['tasks']}")
+    for title, summary in (('Processors', report['processors']), ('Cores', report['cores'])):
+        chi_square = summary['chi_square']
+        verdict = 'равномерное' if chi_square['uniform'] else 'неравномерное'
+        print(f"{title}: mean {summary['mean']:.2f}, variance {summary['variance']:.2f}, std {summary['std']:.2f}, "
+              f"Jain's index {summary['jain_index']:.6f}, chi-square {chi_square['statistic']:.4f} "
+              f"(p-value {chi_square['p_value']:.4f}): распределение {verdict}")
+    for processor_name, count in report['processors']['counts'].items():
+        print(f"{processor_name}: {count}")
+    print(f"Execution time: {format_latency(report['latency'])}")
+    for task_type, summary in report['latency_by_type'].items():
+        print(f"{task_type}: {format_latency(summary)}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Анализ балансировки нагрузки и времени выполнения задач')
+    parser.add_argument('path', help='CSV-файл времени выполнения задач или каталог бинарного формата')
+    parser.add_argument('-a', '--alpha', type=float, default=ALPHA, help='Уровень значимости критерия хи-квадрат')
+    parser.add_argument('-c', '--clock-speed', type=int, default=10 ** 9, help='Частота процессора для CSV (Гц)')
+    args = parser.parse_args()
+    print_report(analyze(load_output(args.path, args.clock_speed), args.alpha))
@@ -1,23 +1,215 @@
 import numpy as np
 
+SUB_BUCKET_BITS = 7 # Точность гистограммы: 2^7 подынтервалов на каждую степень двойки (погрешность < 1%)
+PENDING_LIMIT = 1024 # Количество значений ряда, после которого они переносятся в агрегаты
+PERCENTILES = (50, 95, 99)
+
+
+# Номера интервалов логарифмической гистограммы (HDR) для неотрицательных целых значений:
+# значения меньше 2 * 2^SUB_BUCKET_BITS хранятся точно, большие - с относительной погрешностью
+# не более 2^-SUB_BUCKET_BITS
+def bucket_indices(values):
+    sub_count = 1 << SUB_BUCKET_BITS
+    values = np.asarray(values, dtype=np.int64)
+    bit_length = np.frexp(values.astype(np.float64))[1] # Количество значащих битов значения
+    shift = np.maximum(bit_length - SUB_BUCKET_BITS - 1, 0)
+    return np.where(shift == 0, values, shift * sub_count + (values >> shift))
 
-class Statistics:
 
+# Середина интервала гистограммы с номером bucket
+def bucket_value(bucket):
+    sub_count = 1 << SUB_BUCKET_BITS
+    if bucket < 2 * sub_count:
+        return bucket
+    shift = bucket // sub_count - 1
+    lower = (bucket - shift * sub_count) << shift
+    return lower + ((1 << shift) - 1) / 2
+
+
+# Онлайн-статистика одного ряда значений (время выполнения в тактах): количество, среднее
+# и дисперсия по Уэлфорду, минимум, максимум и гистограмма для квантилей.
+# Память не зависит от количества значений; ряды разных запусков объединяются через merge
+class SeriesStats:
     def __init__(self):
-        self.execution_times = []
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0 # Сумма квадратов отклонений от среднего
+        self.min = None
+        self.max = None
+        self.histogram = np.zeros(0, dtype=np.int64) # Количество значений в интервалах гистограммы
 
-    def print_stats(self):
+    # Добавляет блок значений и объединяет его агрегаты с накопленными (формула Чана)
+    def add_many(self, values):
+        values = np.asarray(values, dtype=np.int64)
+        if not len(values):
+            return
+        other = SeriesStats()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = int(values.min())
+        other.max = int(values.max())
+        buckets = bucket_indices(values)
+        other.histogram = np.bincount(buckets, minlength=1).astype(np.int64)
+        self.merge(other)
+
+    def add(self, value):
+        self.add_many([value])
+
+    def merge(self, other):
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        if len(other.histogram) > len(self.histogram):
+            self.histogram = np.concatenate([self.histogram,
+                                             np.zeros(len(other.histogram) - len(self.histogram), dtype=np.int64)])
+        self.histogram[:len(other.histogram)] += other.histogram
+
+    def copy(self):
+        other = SeriesStats()
+        other.count, other.mean, other.m2, other.min, other.max = self.count, self.mean, self.m2, self.min, self.max
+        other.histogram = self.histogram.copy()
+        return other
+
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+    def std(self):
+        return self.variance() ** 0.5
 
-        average_time = np.mean(self.execution_times)
-        print(f"Average task execution time: {average_time:.9f} seconds.")
+    # Оценка квантиля (q от 0 до 100) по гистограмме, в пределах [min, max]
+    def percentile(self, q):
+        if not self.count:
+            return None
+        rank = max(int(np.ceil(q / 100 * self.count)), 1)
+        bucket = int(np.searchsorted(np.cumsum(self.histogram), rank))
+        return min(max(bucket_value(bucket), self.min), self.max)
 
-        min_time = np.min(self.execution_times)
-        max_time = np.max(self.execution_times)
-        print(f"Minimum execution time: {min_time:.9f} seconds.")
-        print(f"Maximum execution time: {max_time:.9f} seconds.")
 
-        print(f'Временной квант времени для выполнения задачи {10 / (1 * (10 ** 9)):.18f} секунд')
+# Статистика времени выполнения задач: общая и с разбивкой по процессорам, ядрам и типам задач.
+# Значения копятся небольшими блоками по ключу (процессор, ядро, тип) и переносятся в ряды
+# блоками по PENDING_LIMIT, поэтому объем памяти ограничен и не растет с числом задач
+class Statistics:
+
+    def __init__(self, clock_speed=10 ** 9, time_quantum=10):
+        self.clock_speed = clock_speed # Частота процессора для перевода тактов в секунды
+        self.time_quantum = time_quantum # Временной квант планировщика в тактах
+        self.total = SeriesStats()
+        self.by_processor = {}
+        self.by_core = {} # Ключ - (процессор, ядро)
+        self.by_type = {}
+        self.pending = {} # (процессор, ядро, тип) -> значения, еще не перенесенные в ряды
+
+    # Добавляет время выполнения одной задачи в тактах
+    def record(self, cycles, processor_name, core_name, task_type):
+        key = (processor_name, core_name, task_type)
+        values = self.pending.get(key)
+        if values is None:
+            values = self.pending[key] = []
+        values.append(cycles)
+        if len(values) >= PENDING_LIMIT:
+            self.flush_key(key)
+
+    # Добавляет блок значений разных рядов в порядке поступления: codes - номера ключей
+    # (процессор, ядро, тип) в списке keys. Результат совпадает с вызовом record для каждого значения
+    # по очереди: ряды получают те же блоки по PENDING_LIMIT значений в том же порядке
+    def record_many(self, cycles, codes, keys):
+        cycles = np.asarray(cycles, dtype=np.int64)
+        codes = np.asarray(codes, dtype=np.int64)
+        order = np.argsort(codes, kind='stable') # Позиции значений, сгруппированные по ключу
+        bounds = np.searchsorted(codes[order], np.arange(len(keys) + 1))
+        flushes = [] # (позиция значения, заполнившего блок, ключ, значения блока)
+        insertions = [] # (позиция первого значения, ключ, значения) - ключи, заново добавляемые в pending
+        for code in np.flatnonzero(bounds[1:] > bounds[:-1]).tolist():
+            key = keys[code]
+            positions = order[bounds[code]:bounds[code + 1]]
+            values = cycles[positions].tolist()
+            pending = self.pending.get(key)
+            first = PENDING_LIMIT - (len(pending) if pending is not None else 0) # Значений до первого сброса
+            if first > len(values):
+                if pending is None:
+                    insertions.append((int(positions[0]), key, values))
+                else:
+                    pending.extend(values)
+                continue
+            flushes.append((int(positions[first - 1]), key, (pending or []) + values[:first]))
+            for end in range(first + PENDING_LIMIT, len(values) + 1, PENDING_LIMIT):
+                flushes.append((int(positions[end - 1]), key, values[end - PENDING_LIMIT:end]))
+            self.pending.pop(key, None)
+            rest = first + (len(values) - first) // PENDING_LIMIT * PENDING_LIMIT
+            if rest < len(values):
+                insertions.append((int(positions[rest]), key, values[rest:]))
+        for _, key, values in sorted(flushes, key=lambda flush: flush[0]):
+            self.update_series(np.array(values, dtype=np.int64), *key)
+        for _, key, values in sorted(insertions, key=lambda insertion: insertion[0]):
+            self.pending[key] = values
+
+    def update_series(self, values, processor_name, core_name, task_type):
+        self.total.add_many(values)
+        for series, key in ((self.by_processor, processor_name), (self.by_core, (processor_name, core_name)),
+                            (self.by_type, task_type)):
+            if key not in series:
+                series[key] = SeriesStats()
+            series[key].add_many(values)
+
+    def flush_key(self, key):
+        values = self.pending.pop(key)
+        self.update_series(np.array(values, dtype=np.int64), *key)
 
+    # Переносит все накопленные значения в ряды
+    def flush(self):
+        for key in list(self.pending):
+            self.flush_key(key)
 
+    # Независимая копия (снимок для контрольной точки); блоки значений, еще не перенесенные в ряды,
+    # копируются списками целиком, поэтому копия дешевле copy.deepcopy
+    def copy(self):
+        other = Statistics(self.clock_speed, self.time_quantum)
+        other.total = self.total.copy()
+        other.by_processor = {key: stats.copy() for key, stats in self.by_processor.items()}
+        other.by_core = {key: stats.copy() for key, stats in self.by_core.items()}
+        other.by_type = {key: stats.copy() for key, stats in self.by_type.items()}
+        other.pending = {key: list(values) for key, values in self.pending.items()}
+        return other
+
+    # Объединяет статистику другого запуска (например, другого процесса) с текущей
+    def merge(self, other):
+        self.flush()
+        other.flush()
+        self.total.merge(other.total)
+        for series, other_series in ((self.by_processor, other.by_processor), (self.by_core, other.by_core),
+                                     (self.by_type, other.by_type)):
+            for key, stats in other_series.items():
+                if key not in series:
+                    series[key] = SeriesStats()
+                series[key].merge(stats)
+
+    def seconds(self, cycles):
+        return cycles / self.clock_speed
+
+    # Строка с квантилями ряда в секундах
+    def format_percentiles(self, stats):
+        return ', '.join(f"p{q} {self.seconds(stats.percentile(q)):.9f}" for q in PERCENTILES)
+
+    def print_stats(self):
+        self.flush()
+        if not self.total.count:
+            print("No completed tasks.")
+        else:
+            print(f"Average task execution time: {self.seconds(self.total.mean):.9f} seconds.")
 
+            print(f"Minimum execution time: {self.seconds(self.total.min):.9f} seconds.")
+            print(f"Maximum execution time: {self.seconds(self.total.max):.9f} seconds.")
+            print(f"Standard deviation: {self.seconds(self.total.std()):.9f} seconds.")
+            print(f"Execution time percentiles (seconds): {self.format_percentiles(self.total)}.")
+            for task_type, stats in self.by_type.items():
+                print(f"{task_type}: {stats.count} tasks, mean {self.seconds(stats.mean):.9f} seconds, "
+                      f"{self.format_percentiles(stats)}.")
 
+        print(f'Временной квант времени для выполнения задачи {self.seconds(self.time_quantum):.18f} секунд')
@@ -0,0 +1,119 @@
+import argparse # Для разбора аргументов командной строки
+import csv
+import hashlib # Для зерна сценария по параметрам нагрузки
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from simulator import simulate, DEFAULT_CONFIG
+
+# Параметры сценария по умолчанию (параметры simulate; task_types - настройки типов задач)
+DEFAULT_SCENARIO = dict(DEFAULT_CONFIG, mode='event', virtual=True)
+# Параметры сценария, от которых зависят генерируемые задачи
+WORKLOAD_PARAMETERS = ('task_types', 'num_tasks', 'trace')
+
+
+# Декартово произведение значений параметров поверх базового сценария
+def grid(base=None, **axes):
+    names = list(axes)
+    return [dict(base or {}, **dict(zip(names, values))) for values in itertools.product(*axes.values())]
+
+
+# Детерминированное зерно сценария: зависит только от базового зерна и параметров нагрузки
+# (WORKLOAD_PARAMETERS), поэтому сценарии, отличающиеся настройками планирования, выполняют
+# одни и те же задачи и используют одну запись кэша нагрузок. replica - номер независимого
+# повтора той же нагрузки
+def scenario_seed(base_seed, scenario, replica=0):
+    material = json.dumps([scenario.get(name) for name in WORKLOAD_PARAMETERS])
+    workload = int.from_bytes(hashlib.sha256(material.encode('utf-8')).digest()[:8], 'little')
+    return int(np.random.SeedSequence(base_seed, spawn_key=(workload, replica)).generate_state(1)[0])
+
+
+# Выполняет один сценарий в отдельном процессе и возвращает строку таблицы результатов
+def run_scenario(scenario):
+    scenario = dict(DEFAULT_SCENARIO, **scenario)
+    index = scenario.pop('index')
+    started = time.perf_counter()
+    results = simulate(scenario)
+    wall_time = time.perf_counter() - started
+
+    execution_times = results.stats.total
+    seconds = results.stats.seconds
+    completed = list(results.completed_by_processor.values())
+    expired = list(results.expired_by_core.values())
+    packing_report = results.packing_report
+    return {
+        'index': index,
+        'seed': scenario['seed'],
+        'time_quantum': scenario['time_quantum'],
+        'processors_count': scenario['processors_count'],
+        'num_cores': scenario['num_cores'],
+        'num_tasks': scenario['num_tasks'],
+        'mode': scenario['mode'],
+        'packing': scenario['packing'],
+        'scheduler': scenario['scheduler'],
+        'cycles': results.execution_cycles,
+        'completed_total': results.completed_tasks,
+        'expired_total': results.expired_tasks,
+        'completed_per_processor': ';'.join(map(str, completed)),
+        'completed_per_cycle': results.completed_tasks / max(results.execution_cycles, 1),
+        'expired_per_core': ';'.join(map(str, expired)),
+        'execution_time_mean': seconds(execution_times.mean) if execution_times.count else '',
+        'execution_time_std': seconds(execution_times.std()) if execution_times.count else '',
+        'execution_time_min': seconds(execution_times.min) if execution_times.count else '',
+        'execution_time_max': seconds(execution_times.max) if execution_times.count else '',
+        'execution_time_p50': seconds(execution_times.percentile(50)) if execution_times.count else '',
+        'execution_time_p95': seconds(execution_times.percentile(95)) if execution_times.count else '',
+        'execution_time_p99': seconds(execution_times.percentile(99)) if execution_times.count else '',
+        'frames': packing_report.get('frames'),
+        'mean_frame_fill_percentage': packing_report.get('mean_fill_percentage'),
+        'transfer_time': packing_report.get('transfer_time'),
+        'wall_time': wall_time,
+    }
+
+
+# Запускает все сценарии в пуле процессов; сценарию без зерна (seed None, как в DEFAULT_SCENARIO)
+# присваивается детерминированное зерно его нагрузки
+def run_sweep(scenarios, base_seed=0, workers=None):
+    scenarios = [dict(scenario, index=index,
+                      seed=scenario_seed(base_seed, scenario) if scenario.get('seed') is None else scenario['seed'])
+                 for index, scenario in enumerate(scenarios)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        rows = list(executor.map(run_scenario, scenarios))
+    return sorted(rows, key=lambda row: row['index'])
+
+
+def write_results(rows, path):
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# Читает описание перебора из JSON: {"base": {...}, "grid": {"time_quantum": [...], ...}}
+# или {"scenarios": [{...}, ...]}; необязательное поле "seed" - базовое зерно
+def load_scenarios(path):
+    with open(path, encoding='utf-8') as file:
+        spec = json.load(file)
+    base = dict(DEFAULT_SCENARIO, **spec.get('base', {}))
+    if 'scenarios' in spec:
+        return [dict(base, **scenario) for scenario in spec['scenarios']], spec.get('seed', 0)
+    return grid(base, **spec.get('grid', {})), spec.get('seed', 0)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Параллельный перебор параметров симуляции Round Robin')
+    parser.add_argument('spec', help='JSON-файл с сеткой или списком сценариев')
+    parser.add_argument('-o', '--output', default='sweep_results.csv', help='CSV-файл таблицы результатов')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(), help='Количество процессов')
+    parser.add_argument('-c', '--workload-cache', help='Каталог кэша нагрузок (сценарии с одинаковыми '
+                                                       'параметрами генерации и зерном используют одну нагрузку)')
+    args = parser.parse_args()
+    scenarios, base_seed = load_scenarios(args.spec)
+    if args.workload_cache:
+        scenarios = [dict(scenario, workload_cache=args.workload_cache) for scenario in scenarios]
+    results = run_sweep(scenarios, base_seed=base_seed, workers=args.workers)
+    write_results(results, args.output)
+    print(f'{len(results)} scenarios written to {args.output}')
@@ -0,0 +1,287 @@
+import numpy as np
+
+# Статусы задач; в таблице задач хранится индекс статуса в этом кортеже
+STATUSES = ("In queue", "Working", "In work", "Completed", "TTL Expired")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+IN_WORK = STATUS_CODES['In work']
+
+
+# Исход кванта задачи с остатком операций remaining и TTL ttl в замкнутой форме. Результат совпадает
+# с time_quantum шагами Core.execute_task: за одну операцию TTL уменьшается на 2, завершение
+# проверяется раньше истечения TTL. Возвращает итоговый статус задачи ('Completed', 'TTL Expired'
+# или 'In queue') и количество выполненных операций
+def quantum_outcome(remaining, ttl, time_quantum):
+    if time_quantum <= 0:
+        return "In queue", 0
+    if remaining <= 0:
+        return "Completed", 0
+    if ttl <= 0:
+        return "TTL Expired", 0
+    steps = min(remaining, (ttl + 1) // 2, time_quantum)
+    if remaining <= steps:
+        return "Completed", steps
+    if ttl <= 2 * steps:
+        return "TTL Expired", steps
+    return "In queue", steps
+
+
+class Task:
+    __slots__ = ('name', 'ticks_to_complete', 'size', 'remaining_operations', 'status', 'start_time', 'end_time',
+                 'ttl', 'task_type', 'arrival_time')
+
+    def __init__(self, name, task_type, ticks_to_complete, size, ttl):
+        self.name = name # Уникальное имя задачи
+        self.ticks_to_complete = ticks_to_complete # Время для завершения задачи в тактах
+        self.size = 64 * size # Размер задачи в битах
+        self.remaining_operations = self.ticks_to_complete # Остаток операций (изначально равен общему количеству)
+        self.status = "In queue" # Начальный статус задачи
+        self.start_time = None # Время начала выполнения задачи
+        self.end_time = None # Время завершения задачи
+        self.ttl = ttl
+        self.task_type = task_type
+        self.arrival_time = 0 # Такт поступления задачи в систему
+
+    # Метод для выполнения одного шага задачи
+    def run(self):
+        self.remaining_operations -= 1 # Уменьшает количество оставшихся тактов на 1
+        self.ttl -= 1
+        if self.remaining_operations <= 0: # Если операции закончилис
+            self.remaining_operations = 0 # Устанавливает остаток операций в 0
+        if self.ttl <= 0:
+            self.ttl = 0
+        return self.remaining_operations # Возвращает количество оставшихся операций
+
+    # Выполняет весь временной квант сразу, без пошагового вызова run() (см. quantum_outcome).
+    # Возвращает итоговый статус задачи: 'Completed', 'TTL Expired' или 'In queue'
+    def run_quantum(self, time_quantum):
+        outcome, steps = quantum_outcome(self.remaining_operations, self.ttl, time_quantum)
+        if steps:
+            self.remaining_operations -= steps
+            self.ttl -= 2 * steps
+            self.status = 'In work'
+        return outcome
+
+    # Форматирует строковое представление задачи
+    def __str__(self):
+        return f"Task {self.name} (Operations: {self.remaining_operations}/{self.ticks_to_complete}, Size: {self.size} bits, Status: {self.status})"
+
+
+# Столбцы таблицы задач, которые меняются при выполнении задач
+EXECUTION_COLUMNS = ('remaining_operations', 'ttl', 'status', 'start_time', 'end_time')
+
+
+# Компактная таблица задач: каждый атрибут хранится отдельным NumPy-массивом,
+# статус и тип задачи - целочисленными кодами
+class TaskTable:
+    def __init__(self, task_types, count):
+        self.task_types = list(task_types) # Имена типов задач, индекс в списке - код типа
+        self.name = np.arange(count, dtype=np.int64) # Имена задач
+        self.type = np.zeros(count, dtype=np.int8) # Коды типов задач
+        self.ticks_to_complete = np.zeros(count, dtype=np.int32)
+        self.size = np.zeros(count, dtype=np.int32) # Размер задачи в битах
+        self.remaining_operations = np.zeros(count, dtype=np.int32)
+        self.ttl = np.zeros(count, dtype=np.int32)
+        self.status = np.zeros(count, dtype=np.int8) # Коды статусов (STATUSES)
+        self.start_time = np.full(count, -1, dtype=np.int64) # -1 - задача еще не выполнялась
+        self.end_time = np.full(count, -1, dtype=np.int64)
+        self.arrival_time = np.zeros(count, dtype=np.int64) # Такт поступления задачи (для воспроизведения трасс)
+
+    # Генерирует задачи векторно: тип выбирается равновероятно, количество тактов и размер -
+    # равномерно из диапазонов конфигурации типа (включая границы)
+    @classmethod
+    def generate(cls, config, count, rng):
+        table = cls(config.keys(), count)
+        task_configs = [config[task_type] for task_type in table.task_types]
+        table.type[:] = rng.integers(0, len(task_configs), count)
+        tick_low = np.array([task_config['tick_range'][0] for task_config in task_configs])
+        tick_high = np.array([task_config['tick_range'][1] for task_config in task_configs])
+        size_low = np.array([task_config['size_range'][0] for task_config in task_configs])
+        size_high = np.array([task_config['size_range'][1] for task_config in task_configs])
+        ttl = np.array([task_config['ttl'] for task_config in task_configs])
+        table.ticks_to_complete[:] = rng.integers(tick_low[table.type], tick_high[table.type] + 1)
+        table.size[:] = 64 * rng.integers(size_low[table.type], size_high[table.type] + 1)
+        table.remaining_operations[:] = table.ticks_to_complete
+        table.ttl[:] = ttl[table.type]
+        return table
+
+    # Столбцы таблицы в виде словаря имя столбца -> массив
+    def columns(self):
+        return {'name': self.name, 'type': self.type, 'ticks_to_complete': self.ticks_to_complete, 'size': self.size,
+                'remaining_operations': self.remaining_operations, 'ttl': self.ttl, 'status': self.status,
+                'start_time': self.start_time, 'end_time': self.end_time, 'arrival_time': self.arrival_time}
+
+    # Снимок столбцов для контрольной точки: столбцы, которые меняются при выполнении задач,
+    # копируются, параметры задач передаются как есть
+    def snapshot(self):
+        return {column: values.copy() if column in EXECUTION_COLUMNS else values
+                for column, values in self.columns().items()}
+
+    # Новая таблица из выбранных строк
+    def take(self, indices):
+        table = TaskTable(self.task_types, 0)
+        for column, values in self.columns().items():
+            setattr(table, column, values[indices])
+        return table
+
+    # Объединяет таблицы с одинаковыми типами задач в одну
+    @staticmethod
+    def concat(tables):
+        table = TaskTable(tables[0].task_types, 0)
+        for column in table.columns():
+            setattr(table, column, np.concatenate([getattr(part, column) for part in tables]))
+        return table
+
+    def __len__(self):
+        return len(self.name)
+
+    def __iter__(self):
+        return (TaskView(self, index) for index in range(len(self.name)))
+
+    def __getitem__(self, index):
+        return TaskView(self, index)
+
+    def row(self, index):
+        return TaskView(self, index)
+
+    # Количество байт, занимаемых столбцами таблицы
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns().values())
+
+
+# Легковесное представление строки таблицы задач с интерфейсом Task
+class TaskView(Task):
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, TaskView) and self.table is other.table and self.index == other.index
+
+    # Task.run_quantum над строкой таблицы: остаток операций и TTL читаются и записываются один раз
+    def run_quantum(self, time_quantum):
+        table, index = self.table, self.index
+        outcome, steps = quantum_outcome(int(table.remaining_operations[index]), int(table.ttl[index]), time_quantum)
+        if steps:
+            table.remaining_operations[index] -= steps
+            table.ttl[index] -= 2 * steps
+            table.status[index] = IN_WORK
+        return outcome
+
+    def __hash__(self):
+        return hash((id(self.table), self.index))
+
+    @property
+    def name(self):
+        return int(self.table.name[self.index])
+
+    @property
+    def task_type(self):
+        return self.table.task_types[self.table.type[self.index]]
+
+    @property
+    def ticks_to_complete(self):
+        return int(self.table.ticks_to_complete[self.index])
+
+    @property
+    def size(self):
+        return int(self.table.size[self.index])
+
+    @property
+    def remaining_operations(self):
+        return int(self.table.remaining_operations[self.index])
+
+    @remaining_operations.setter
+    def remaining_operations(self, value):
+        self.table.remaining_operations[self.index] = value
+
+    @property
+    def ttl(self):
+        return int(self.table.ttl[self.index])
+
+    @ttl.setter
+    def ttl(self, value):
+        self.table.ttl[self.index] = value
+
+    @property
+    def status(self):
+        return STATUSES[self.table.status[self.index]]
+
+    @status.setter
+    def status(self, value):
+        self.table.status[self.index] = STATUS_CODES[value]
+
+    @property
+    def start_time(self):
+        start_time = int(self.table.start_time[self.index])
+        return None if start_time < 0 else start_time
+
+    @start_time.setter
+    def start_time(self, value):
+        self.table.start_time[self.index] = -1 if value is None else value
+
+    @property
+    def end_time(self):
+        end_time = int(self.table.end_time[self.index])
+        return None if end_time < 0 else end_time
+
+    @end_time.setter
+    def end_time(self, value):
+        self.table.end_time[self.index] = -1 if value is None else value
+
+    @property
+    def arrival_time(self):
+        return int(self.table.arrival_time[self.index])
+
+
+# FIFO-очередь задач таблицы с интерфейсом queue.Queue (put, get, empty, qsize).
+# Хранит индексы строк в кольцевом буфере NumPy, а не объекты задач
+class TaskQueue:
+    def __init__(self, table, capacity=1024):
+        self.table = table
+        self.buffer = np.empty(max(capacity, 1), dtype=np.int64)
+        self.head = 0
+        self.size = 0
+
+    def put(self, task):
+        if self.size == len(self.buffer):
+            self.grow()
+        self.buffer[(self.head + self.size) % len(self.buffer)] = task.index
+        self.size += 1
+
+    # Добавляет в очередь массив индексов задач
+    def put_indices(self, indices):
+        while self.size + len(indices) > len(self.buffer):
+            self.grow()
+        tail = (self.head + self.size + np.arange(len(indices))) % len(self.buffer)
+        self.buffer[tail] = indices
+        self.size += len(indices)
+
+    def get(self):
+        index = int(self.buffer[self.head])
+        self.head = (self.head + 1) % len(self.buffer)
+        self.size -= 1
+        return TaskView(self.table, index)
+
+    # Возвращает индексы задач в порядке очереди, не извлекая их
+    def indices(self):
+        return self.buffer[(self.head + np.arange(self.size)) % len(self.buffer)]
+
+    # Извлекает из очереди все индексы задач в порядке очереди
+    def drain_indices(self):
+        indices = self.indices()
+        self.head = 0
+        self.size = 0
+        return indices
+
+    def empty(self):
+        return self.size == 0
+
+    def qsize(self):
+        return self.size
+
+    # Увеличивает буфер вдвое, сохраняя порядок задач
+    def grow(self):
+        self.buffer = np.concatenate([self.indices(), np.empty(len(self.buffer), dtype=np.int64)])
+        self.head = 0
@@ -0,0 +1,16 @@
+import os
+import sys
+import types
+
+# Модули проекта импортируются как модули верхнего уровня, а пакет статистики - как
+# pythonProject.stats (каталог проекта в PyCharm). Если проект лежит в каталоге с другим
+# именем, pythonProject указывает на корень репозитория
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+try:
+    import pythonProject.stats.statistics # noqa: F401
+except ImportError:
+    package = types.ModuleType('pythonProject')
+    package.__path__ = [ROOT]
+    sys.modules['pythonProject'] = package
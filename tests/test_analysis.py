@@ -0,0 +1,39 @@
+import pytest
+from pythonProject.stats.analysis import analyze, load_csv, load_output
+from simulator import simulate
+
+
+@pytest.fixture(autouse=True)
+def working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+# Задач меньше, чем ядер: часть ядер ничего не выполняет, но входит в балансировку с нулем.
+# Отчеты по CSV и по бинарному формату совпадают
+def test_cores_without_completed_tasks_are_counted(tmp_path):
+    results = simulate(dict(seed=1, num_tasks=5, processors_count=2, num_cores=4, mode='batch',
+                            csv_path=str(tmp_path / 'task_times.csv'), binary_dir=str(tmp_path / 'task_times')))
+    processor_names = [processor.name for processor in results.processors]
+    core_names = [core.name for core in results.processors[0].cores]
+    binary = analyze(load_output(str(tmp_path / 'task_times')))
+    text = analyze(load_output(str(tmp_path / 'task_times.csv'), processor_names=processor_names,
+                               core_names=core_names))
+    assert len(binary['cores']['counts']) == 8
+    assert sum(binary['cores']['counts'].values()) == results.completed_tasks
+    assert 0 in binary['cores']['counts'].values()
+    assert text['cores'] == binary['cores']
+    assert text['processors'] == binary['processors']
+
+
+# Файл прежнего формата (6 столбцов, без типа задачи) читается так же, как текущий, без разбивки по типам
+def test_csv_without_task_type_is_accepted(tmp_path):
+    simulate(dict(seed=1, num_tasks=200, processors_count=2, num_cores=2, csv_path=str(tmp_path / 'task_times.csv')))
+    lines = (tmp_path / 'task_times.csv').read_text(encoding='utf-8').splitlines()
+    (tmp_path / 'old.csv').write_text(''.join(line.rsplit(',', 1)[0] + '\n' for line in lines), encoding='utf-8')
+    current = load_csv(str(tmp_path / 'task_times.csv'))
+    old = load_csv(str(tmp_path / 'old.csv'))
+    assert 'type' in current and 'type' not in old
+    for column in ('name', 'start', 'end', 'processor', 'core'):
+        assert old[column].tolist() == current[column].tolist()
+    assert analyze(old)['latency_by_type'] == {}
+    assert analyze(old)['cores'] == analyze(current)['cores']
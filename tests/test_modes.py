@@ -0,0 +1,117 @@
+import os
+import pytest
+import checkpoint
+from simulator import simulate
+
+# Небольшой запуск с истечением TTL и возвратом задач в очередь
+CONFIG = dict(seed=3, num_tasks=3000, processors_count=3, num_cores=4, time_quantum=4,
+              task_types={'Cycling': {'ttl': 40, 'tick_range': (10, 50), 'size_range': (1, 20)},
+                          'Periodic': {'ttl': 30, 'tick_range': (5, 20), 'size_range': (1, 10)},
+                          'Impulse': {'ttl': 12, 'tick_range': (1, 5), 'size_range': (1, 5)}})
+
+
+# Выполняет запуск в каталоге directory; возвращает итоги и содержимое CSV времени выполнения
+def run(directory, **config):
+    os.makedirs(directory, exist_ok=True)
+    csv_path = os.path.join(directory, 'task_times.csv')
+    results = simulate(dict(CONFIG, csv_path=csv_path, **config))
+    with open(csv_path, 'rb') as file:
+        return results, file.read()
+
+
+@pytest.fixture(autouse=True)
+def working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path) # Логи и прочие файлы запусков пишутся во временный каталог
+
+
+def counters(results):
+    return (results.cycle_time, results.completed_tasks, results.expired_tasks, results.completed_by_processor,
+            results.completed_by_type, results.expired_by_core, results.stats.total.count, results.stats.total.mean,
+            results.mean_wait_cycles, results.max_wait_cycles)
+
+
+@pytest.mark.parametrize('mode', ['event', 'batch'])
+def test_mode_matches_tick(tmp_path, mode):
+    tick, tick_csv = run(tmp_path / 'tick', mode='tick')
+    other, other_csv = run(tmp_path / mode, mode=mode)
+    assert counters(other) == counters(tick)
+    assert other_csv == tick_csv
+
+
+# С сообщениями о каждой задаче пакетный режим учитывает результаты по задачам, а не массивами
+def test_batch_with_task_logs_matches_tick(tmp_path):
+    tick, tick_csv = run(tmp_path / 'tick', mode='tick')
+    batch, batch_csv = run(tmp_path / 'batch', mode='batch', log_level='INFO', log_files=True)
+    assert counters(batch) == counters(tick)
+    assert batch_csv == tick_csv
+
+
+@pytest.mark.parametrize('scheduler', ['earliest_ttl', 'shortest_remaining', 'mlfq'])
+def test_event_matches_tick_for_schedulers(tmp_path, scheduler):
+    tick, tick_csv = run(tmp_path / 'tick', mode='tick', scheduler=scheduler)
+    event, event_csv = run(tmp_path / 'event', mode='event', scheduler=scheduler)
+    assert counters(event) == counters(tick)
+    assert event_csv == tick_csv
+
+
+@pytest.mark.parametrize('options', [dict(pipelined=True, channels=2), dict(memory_model=True, memory_size=20000),
+                                     dict(streaming=True, buffer_size=64)])
+def test_event_matches_tick_with_channel_and_memory_models(tmp_path, options):
+    tick, tick_csv = run(tmp_path / 'tick', mode='tick', **options)
+    event, event_csv = run(tmp_path / 'event', mode='event', **options)
+    assert counters(event) == counters(tick)
+    assert event_csv == tick_csv
+    assert event.memory is None or (event.memory['admission_stalls'] == tick.memory['admission_stalls'] and
+                                    event.memory['sample_used'].tolist() == tick.memory['sample_used'].tolist())
+
+
+# Прерывает запуск после второй контрольной точки и восстанавливает обычное сохранение
+def interrupt(monkeypatch, directory, **options):
+    save = checkpoint.Checkpointer.save
+    saves = []
+
+    def interrupted_save(self, *arguments):
+        save(self, *arguments)
+        saves.append(self.next_cycle)
+        if len(saves) == 2:
+            self.wait()
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(checkpoint.Checkpointer, 'save', interrupted_save)
+    with pytest.raises(KeyboardInterrupt):
+        run(directory, **options)
+    assert os.path.exists(directory / 'run.ckpt')
+    monkeypatch.setattr(checkpoint.Checkpointer, 'save', save)
+
+
+# Запуск прерывается исключением после второй контрольной точки и продолжается с нее;
+# итоги и файлы совпадают с непрерванным запуском
+@pytest.mark.parametrize('mode', ['tick', 'event', 'batch'])
+def test_checkpoint_resume_is_exact(tmp_path, monkeypatch, mode):
+    expected, expected_csv = run(tmp_path / 'full', mode=mode)
+    directory = tmp_path / 'resumed'
+    options = dict(mode=mode, checkpoint_path=str(directory / 'run.ckpt'), checkpoint_interval=20, resume=True)
+    interrupt(monkeypatch, directory, **options)
+    resumed, resumed_csv = run(directory, **options)
+    assert counters(resumed) == counters(expected)
+    assert resumed_csv == expected_csv
+    assert not os.path.exists(directory / 'run.ckpt')
+
+
+# Поступление задач по конвейеру и освобождение памяти зависят от сохранённых моментов передачи
+def test_pipelined_resume_is_exact(tmp_path, monkeypatch):
+    pipeline = dict(pipelined=True, channels=1, memory_model=True, memory_size=20000)
+    expected, expected_csv = run(tmp_path / 'full', **pipeline)
+    directory = tmp_path / 'resumed'
+    options = dict(pipeline, checkpoint_path=str(directory / 'run.ckpt'), checkpoint_interval=20, resume=True)
+    interrupt(monkeypatch, directory, **options)
+    resumed, resumed_csv = run(directory, **options)
+    assert counters(resumed) == counters(expected)
+    assert resumed_csv == expected_csv
+
+
+def test_resume_without_seed_is_refused(tmp_path, monkeypatch):
+    options = dict(seed=None, checkpoint_path=str(tmp_path / 'run.ckpt'), checkpoint_interval=20, resume=True)
+    interrupt(monkeypatch, tmp_path, **options)
+    with pytest.raises(ValueError):
+        run(tmp_path, **options)
@@ -0,0 +1,31 @@
+import random
+from pythonProject.stats import statistics
+from pythonProject.stats.statistics import Statistics
+
+KEYS = [(f'P{number % 2}', f'C{number}', f'T{number % 3}') for number in range(5)]
+
+
+def series(stats):
+    return stats.count, stats.mean, stats.m2, stats.min, stats.max, stats.histogram.tolist()
+
+
+# Блок значений разных рядов дает те же агрегаты и тот же порядок рядов, что и поочередные record,
+# в том числе когда блок заполняет ряд несколько раз
+def test_record_many_matches_record(monkeypatch):
+    monkeypatch.setattr(statistics, 'PENDING_LIMIT', 7)
+    generator = random.Random(1)
+    one_by_one, blocks = Statistics(), Statistics()
+    for _ in range(50):
+        codes = [generator.randrange(len(KEYS)) for _ in range(generator.randint(0, 40))]
+        values = [generator.randint(0, 10 ** 6) for _ in codes]
+        for code, value in zip(codes, values):
+            one_by_one.record(value, *KEYS[code])
+        blocks.record_many(values, codes, KEYS)
+        assert list(blocks.pending.items()) == list(one_by_one.pending.items())
+    one_by_one.flush()
+    blocks.flush()
+    assert series(blocks.total) == series(one_by_one.total)
+    for name in ('by_processor', 'by_core', 'by_type'):
+        expected, actual = getattr(one_by_one, name), getattr(blocks, name)
+        assert list(actual) == list(expected)
+        assert [series(stats) for stats in actual.values()] == [series(stats) for stats in expected.values()]
@@ -0,0 +1,45 @@
+import json
+import os
+import pytest
+from sweep import load_scenarios, run_sweep
+
+SPEC = {'base': {'num_tasks': 500, 'processors_count': 2, 'num_cores': 2},
+        'grid': {'time_quantum': [2, 8]}, 'seed': 7}
+
+
+@pytest.fixture(autouse=True)
+def working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+# Строки результатов без времени выполнения самого запуска
+def rows(spec_path, **options):
+    scenarios, base_seed = load_scenarios(spec_path)
+    scenarios = [dict(scenario, **options) for scenario in scenarios]
+    return [{column: value for column, value in row.items() if column != 'wall_time'}
+            for row in run_sweep(scenarios, base_seed=base_seed, workers=1)]
+
+
+# Сценарии без зерна получают зерна от базового зерна перебора, поэтому повторный запуск
+# того же описания дает те же строки, в том числе с кэшем нагрузок
+def test_sweep_is_deterministic(tmp_path):
+    spec_path = tmp_path / 'spec.json'
+    spec_path.write_text(json.dumps(SPEC), encoding='utf-8')
+    first = rows(spec_path)
+    assert all(row['seed'] is not None for row in first)
+    assert first == rows(spec_path)
+    assert rows(spec_path, workload_cache=str(tmp_path / 'cache')) == first
+
+
+# Сценарии, отличающиеся только квантом, выполняют одну нагрузку и делят запись кэша;
+# другое количество задач дает другое зерно
+def test_scheduler_variants_share_workload(tmp_path):
+    spec_path = tmp_path / 'spec.json'
+    spec_path.write_text(json.dumps(dict(SPEC, grid={'time_quantum': [2, 8], 'num_tasks': [500, 600]})),
+                         encoding='utf-8')
+    cache = tmp_path / 'cache'
+    seeds = {(row['num_tasks'], row['time_quantum']): row['seed'] for row in rows(spec_path, workload_cache=str(cache))}
+    assert seeds[500, 2] == seeds[500, 8]
+    assert seeds[600, 2] == seeds[600, 8]
+    assert seeds[500, 2] != seeds[600, 2]
+    assert len(os.listdir(cache)) == 2
@@ -0,0 +1,16 @@
+from tuner import QuantumEvaluator, tune_quantum
+from sweep import DEFAULT_SCENARIO
+
+BASE = dict(num_tasks=2000, seed=3)
+SWITCH_COST = 2
+
+
+# Переключение контекста делает слишком малые кванты невыгодными, простой ядер - слишком большие:
+# лучший квант лежит внутри отрезка поиска
+def test_best_quantum_is_interior():
+    result = tune_quantum(BASE, SWITCH_COST, method='golden_section', low=1, high=64, workers=1)
+    assert 1 < result['best'] < 64
+    assert result['switch_cost'] == SWITCH_COST
+    evaluator = QuantumEvaluator(dict(DEFAULT_SCENARIO, **BASE), [BASE['seed']], SWITCH_COST, workers=1)
+    scores = evaluator.evaluate([1, 64], 2000)
+    assert result['tasks_per_second'] > max(scores.values())
@@ -0,0 +1,243 @@
+import argparse # Для разбора аргументов командной строки
+import json
+import os
+import numpy as np
+from batch_executor import COMPLETED, EXPIRED, REQUEUED
+
+# Запись временной шкалы: ядро (номер среди всех ядер), исход, имя задачи, такты начала и конца
+# интервала (включительно). Исход - результат последнего кванта интервала (коды batch_executor)
+TIMELINE_DTYPE = np.dtype([('core', np.int32), ('outcome', np.int8), ('task', np.int64), ('start', np.int64),
+                           ('end', np.int64)])
+OUTCOME_NAMES = {COMPLETED: 'Completed', EXPIRED: 'TTL Expired', REQUEUED: 'In queue'}
+
+
+# Запись временной шкалы занятости ядер. Кванты одной задачи на одном ядре в соседних тактах
+# объединяются в один интервал (run-length encoding), такты без интервалов - простой ядра.
+# Интервалы копятся блоками по chunk_size и дописываются в файл intervals.bin каталога directory
+# через np.memmap, файл увеличивается вдвое при заполнении. meta.json содержит количество
+# записей, имена процессоров и ядер и границы шкалы
+class TimelineWriter:
+    def __init__(self, directory, cores, chunk_size=65536, initial_capacity=65536):
+        self.directory = directory
+        self.names = [(core.processor.name, core.name) for core in cores] # Имена процессора и ядра по номеру ядра
+        self.positions = {core: position for position, core in enumerate(cores)} # Ядро -> номер
+        self.chunk_size = chunk_size
+        self.capacity = initial_capacity # Размер файла в записях
+        self.count = 0 # Количество записей в файле
+        self.pending = [] # Закрытые интервалы, еще не записанные в файл
+        # Открытый интервал каждого ядра: задача (-1 - нет), такты начала и конца, исход
+        self.open_task = [-1] * len(cores)
+        self.open_start = [0] * len(cores)
+        self.open_end = [0] * len(cores)
+        self.open_outcome = [REQUEUED] * len(cores)
+        self.first_cycle = None # Первый и последний такт шкалы
+        self.last_cycle = None
+        self.intervals = None
+
+    def path(self):
+        return os.path.join(self.directory, 'intervals.bin')
+
+    # Создает (очищает) файл шкалы
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(), 'wb') as file:
+            file.truncate(self.capacity * TIMELINE_DTYPE.itemsize)
+        self.open_file()
+
+    def open_file(self):
+        self.intervals = np.memmap(self.path(), dtype=TIMELINE_DTYPE, mode='r+', shape=(self.capacity,))
+
+    # Записывает квант задачи task (имя) на ядре core в такте cycle с исходом outcome
+    def record(self, core, task, cycle, outcome):
+        if self.intervals is None:
+            self.start()
+        position = self.positions[core]
+        if (self.open_task[position] == task and self.open_end[position] == cycle - 1
+                and self.open_outcome[position] == REQUEUED):
+            # Продолжение интервала: та же задача на том же ядре в следующем такте
+            self.open_end[position] = cycle
+            self.open_outcome[position] = outcome
+            return
+        if self.open_task[position] >= 0:
+            self.close_interval(position)
+        self.open_task[position] = task
+        self.open_start[position] = cycle
+        self.open_end[position] = cycle
+        self.open_outcome[position] = outcome
+        if self.first_cycle is None:
+            self.first_cycle = cycle
+
+    def close_interval(self, position):
+        self.pending.append((position, self.open_outcome[position], self.open_task[position],
+                             self.open_start[position], self.open_end[position]))
+        self.last_cycle = max(self.last_cycle or 0, self.open_end[position])
+        self.open_task[position] = -1
+        if len(self.pending) >= self.chunk_size:
+            self.flush()
+
+    # Дописывает накопленные интервалы в файл, при необходимости увеличивая его
+    def flush(self):
+        if not self.pending:
+            return
+        records = np.array(self.pending, dtype=TIMELINE_DTYPE)
+        self.pending = []
+        if self.count + len(records) > self.capacity:
+            self.grow(self.count + len(records))
+        self.intervals[self.count:self.count + len(records)] = records
+        self.count += len(records)
+
+    def grow(self, required):
+        self.intervals.flush()
+        self.intervals = None
+        self.capacity = max(2 * self.capacity, required)
+        with open(self.path(), 'r+b') as file:
+            file.truncate(self.capacity * TIMELINE_DTYPE.itemsize)
+        self.open_file()
+
+    def meta(self):
+        return {'count': self.count, 'first_cycle': self.first_cycle, 'last_cycle': self.last_cycle,
+                'cores': [list(names) for names in self.names]}
+
+    # Закрывает открытые интервалы, обрезает файл до записанных интервалов и сохраняет meta.json
+    def close(self):
+        if self.intervals is None:
+            self.start()
+        for position, task in enumerate(self.open_task):
+            if task >= 0:
+                self.close_interval(position)
+        self.flush()
+        self.intervals.flush()
+        self.intervals = None
+        with open(self.path(), 'r+b') as file:
+            file.truncate(self.count * TIMELINE_DTYPE.itemsize)
+        with open(os.path.join(self.directory, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump(self.meta(), file)
+
+    # Состояние для контрольной точки (см. RoundRobin.checkpoint_state)
+    def checkpoint(self):
+        if self.intervals is None:
+            self.start()
+        self.flush()
+        self.intervals.flush()
+        return dict(self.meta(), capacity=self.capacity, open_task=list(self.open_task),
+                    open_start=list(self.open_start), open_end=list(self.open_end),
+                    open_outcome=list(self.open_outcome))
+
+    # Продолжает запись с контрольной точки вместо start
+    def resume(self, state):
+        self.count = state['count']
+        self.capacity = max(state['capacity'], self.count)
+        self.first_cycle = state['first_cycle']
+        self.last_cycle = state['last_cycle']
+        self.open_task = list(state['open_task'])
+        self.open_start = list(state['open_start'])
+        self.open_end = list(state['open_end'])
+        self.open_outcome = list(state['open_outcome'])
+        self.pending = []
+        with open(self.path(), 'r+b') as file:
+            file.truncate(self.capacity * TIMELINE_DTYPE.itemsize)
+        self.open_file()
+
+
+# Открывает шкалу только для чтения: интервалы отображаются в память, а не читаются целиком
+def load_timeline(directory):
+    with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as file:
+        meta = json.load(file)
+    path = os.path.join(directory, 'intervals.bin')
+    if meta['count']:
+        intervals = np.memmap(path, dtype=TIMELINE_DTYPE, mode='r', shape=(meta['count'],))
+    else:
+        intervals = np.empty(0, dtype=TIMELINE_DTYPE)
+    return intervals, meta
+
+
+# Обходит интервалы блоками по chunk_size записей
+def iter_chunks(intervals, chunk_size=1 << 20):
+    for start in range(0, len(intervals), chunk_size):
+        yield intervals[start:start + chunk_size]
+
+
+# Занятость ядер за такты first_cycle .. last_cycle (по умолчанию - вся шкала):
+# занятые и простаивающие такты и доля занятых тактов для каждого ядра
+def core_utilization(directory, first_cycle=None, last_cycle=None, chunk_size=1 << 20):
+    intervals, meta = load_timeline(directory)
+    first_cycle = meta['first_cycle'] if first_cycle is None else first_cycle
+    last_cycle = meta['last_cycle'] if last_cycle is None else last_cycle
+    cores_count = len(meta['cores'])
+    busy = np.zeros(cores_count, dtype=np.int64)
+    if first_cycle is not None:
+        for chunk in iter_chunks(intervals, chunk_size):
+            # Части интервалов внутри выбранного отрезка шкалы
+            start = np.maximum(chunk['start'], first_cycle)
+            end = np.minimum(chunk['end'], last_cycle)
+            length = np.maximum(end - start + 1, 0)
+            busy += np.bincount(chunk['core'], weights=length, minlength=cores_count).astype(np.int64)
+    span = last_cycle - first_cycle + 1 if first_cycle is not None else 0
+    return [{'processor': processor, 'core': core, 'busy_cycles': int(busy_cycles),
+             'idle_cycles': int(span - busy_cycles), 'utilization': busy_cycles / span if span else 0.0}
+            for (processor, core), busy_cycles in zip(meta['cores'], busy.tolist())]
+
+
+# Занятые ядро-такты до каждого такта из boundaries (не включая его) по интервалам с отсортированными
+# тактами начала starts и тактами после конца stops: интервал [s, e) дает (t - s)+ - (t - e)+,
+# суммы по интервалам берутся из префиксных сумм
+def busy_before(boundaries, starts, stops):
+    total = np.zeros(len(boundaries), dtype=np.int64)
+    for cycles, sign in ((starts, 1), (stops, -1)):
+        count = np.searchsorted(cycles, boundaries)
+        prefix = np.concatenate([[0], np.cumsum(cycles)])
+        total += sign * (boundaries * count - prefix[count])
+    return total
+
+
+# Количество занятых ядер в среднем по интервалам из bucket_cycles тактов (для графика занятости
+# во времени). Возвращает такты начала интервалов и среднее число занятых ядер.
+# Каждая часть записей сортирует свои такты начала и конца и добавляет занятые ядро-такты только
+# в интервалы графика, которые пересекает: память и время не зависят от длины шкалы в тактах,
+# кроме самого результата
+def occupancy(directory, bucket_cycles=1, chunk_size=1 << 20):
+    intervals, meta = load_timeline(directory)
+    if meta['first_cycle'] is None:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    first_cycle = meta['first_cycle']
+    span = meta['last_cycle'] - first_cycle + 1
+    bucket_starts = np.arange(0, span, bucket_cycles)
+    boundaries = np.append(bucket_starts, span)
+    totals = np.zeros(len(bucket_starts), dtype=np.int64)
+    for chunk in iter_chunks(intervals, chunk_size):
+        starts = np.sort(chunk['start'] - first_cycle)
+        stops = np.sort(chunk['end'] - first_cycle + 1)
+        # До границы low и после границы high занятость части не меняется
+        low = max(int(np.searchsorted(boundaries, starts[0], side='right')) - 1, 0)
+        high = int(np.searchsorted(boundaries, stops[-1]))
+        totals[low:high] += np.diff(busy_before(boundaries[low:high + 1], starts, stops))
+    widths = np.diff(boundaries)
+    return bucket_starts + first_cycle, totals / widths
+
+
+# Сохраняет график занятости ядер во времени в файл (без графического интерфейса)
+def plot_occupancy(directory, path, bucket_cycles=1):
+    from matplotlib.figure import Figure
+    cycles, busy_cores = occupancy(directory, bucket_cycles)
+    fig = Figure(figsize=(12, 6))
+    ax = fig.add_subplot()
+    ax.plot(cycles, busy_cores, color='steelblue', linewidth=0.8)
+    ax.set_xlabel('Такт')
+    ax.set_ylabel('Занятые ядра')
+    ax.set_title('Занятость ядер во времени')
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Занятость и простой ядер по временной шкале симуляции')
+    parser.add_argument('directory', help='Каталог временной шкалы (intervals.bin и meta.json)')
+    parser.add_argument('-p', '--plot', help='Файл графика занятости ядер во времени')
+    parser.add_argument('-b', '--bucket', type=int, default=1, help='Ширина интервала графика в тактах')
+    args = parser.parse_args()
+    for row in core_utilization(args.directory):
+        print(f"{row['processor']} {row['core']}: busy {row['busy_cycles']} cycles, idle {row['idle_cycles']} cycles, "
+              f"utilization {row['utilization'] * 100:.2f}%")
+    if args.plot:
+        plot_occupancy(args.directory, args.plot, args.bucket)
+        print(f'Plot written to {args.plot}')
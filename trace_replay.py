@@ -0,0 +1,127 @@
+import json # Для разбора записей трассы
+import os
+import numpy as np
+from task_table import TaskTable
+
+# Столбцы бинарного кэша трассы: имя столбца таблицы задач и тип хранения
+CACHE_COLUMNS = (('name', np.int64), ('type', np.int8), ('ticks_to_complete', np.int32), ('size', np.int32),
+                 ('ttl', np.int32), ('arrival_time', np.int64))
+
+
+# Каталог кэша разобранной трассы рядом с файлом трассы
+def cache_dir_for(path):
+    return f'{path}.cache'
+
+
+# Проверяет, что кэш построен по текущей версии файла трассы (размер и время изменения)
+def cache_is_valid(path, cache_dir):
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path, encoding='utf-8') as file:
+        meta = json.load(file)
+    source = os.stat(path)
+    return meta['source_size'] == source.st_size and meta['source_mtime_ns'] == source.st_mtime_ns
+
+
+# Построчно разбирает JSONL-трассу и выдает таблицы задач по chunk_size штук.
+# Запись трассы: {"name": 1, "type": "Cycling", "ticks": 30, "size": 640, "ttl": 100, "arrival": 5},
+# size - размер задачи в битах, arrival - такт поступления (необязательный, по умолчанию 0),
+# name - необязательный, по умолчанию номер записи. Такты поступления не должны убывать.
+# Новые типы задач добавляются в конец списка task_types
+def parse_trace(path, task_types, chunk_size=65536):
+    type_codes = {task_type: code for code, task_type in enumerate(task_types)}
+    rows = []
+    last_arrival = 0
+    with open(path, encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            code = type_codes.get(record['type'])
+            if code is None:
+                code = type_codes[record['type']] = len(task_types)
+                task_types.append(record['type'])
+            arrival = record.get('arrival', 0)
+            if arrival < last_arrival:
+                raise ValueError(f'Trace {path}, line {line_number}: arrival cycles must not decrease')
+            last_arrival = arrival
+            rows.append((record.get('name', line_number - 1), code, record['ticks'], record['size'], record['ttl'],
+                         arrival))
+            if len(rows) == chunk_size:
+                yield build_table(task_types, rows)
+                rows = []
+    if rows:
+        yield build_table(task_types, rows)
+
+
+# Таблица задач из разобранных записей трассы
+def build_table(task_types, rows):
+    table = TaskTable(task_types, len(rows))
+    for (column, dtype), values in zip(CACHE_COLUMNS, zip(*rows)):
+        getattr(table, column)[:] = np.array(values, dtype=dtype)
+    table.remaining_operations[:] = table.ticks_to_complete
+    return table
+
+
+# Разбирает трассу и одновременно записывает столбцы в бинарный кэш.
+# Файлы кэша переименовываются в конечные имена только после полного разбора
+def parse_and_cache(path, task_types, cache_dir, chunk_size=65536):
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    source = os.stat(path)
+    parts = {column: open(os.path.join(cache_dir, f'{column}.part'), 'wb') for column, _ in CACHE_COLUMNS}
+    count = 0
+    try:
+        for table in parse_trace(path, task_types, chunk_size):
+            for column, dtype in CACHE_COLUMNS:
+                getattr(table, column).astype(dtype, copy=False).tofile(parts[column])
+            count += len(table)
+            yield table
+    finally:
+        for file in parts.values():
+            file.close()
+    for column, _ in CACHE_COLUMNS:
+        os.replace(os.path.join(cache_dir, f'{column}.part'), os.path.join(cache_dir, f'{column}.bin'))
+    with open(meta_path, 'w', encoding='utf-8') as file:
+        json.dump({'source_size': source.st_size, 'source_mtime_ns': source.st_mtime_ns, 'count': count,
+                   'task_types': task_types}, file)
+
+
+# Читает трассу из бинарного кэша: столбцы отображаются в память и копируются блоками
+def read_cache(cache_dir, task_types, chunk_size=65536):
+    with open(os.path.join(cache_dir, 'meta.json'), encoding='utf-8') as file:
+        meta = json.load(file)
+    count = meta['count']
+    if not count:
+        return
+    # Коды типов кэша переводятся в коды списка task_types
+    type_codes = {task_type: code for code, task_type in enumerate(task_types)}
+    for task_type in meta['task_types']:
+        if task_type not in type_codes:
+            type_codes[task_type] = len(task_types)
+            task_types.append(task_type)
+    recode = np.array([type_codes[task_type] for task_type in meta['task_types']], dtype=np.int8)
+    columns = {column: np.memmap(os.path.join(cache_dir, f'{column}.bin'), dtype=dtype, mode='r', shape=(count,))
+               for column, dtype in CACHE_COLUMNS}
+    for first in range(0, count, chunk_size):
+        last = min(first + chunk_size, count)
+        table = TaskTable(task_types, last - first)
+        for column, values in columns.items():
+            getattr(table, column)[:] = values[first:last]
+        table.type[:] = recode[table.type]
+        table.remaining_operations[:] = table.ticks_to_complete
+        yield table
+
+
+# Источник задач из трассы: при наличии актуального кэша читает его, иначе разбирает
+# JSONL и строит кэш (use_cache=False - только разбор без кэша)
+def load_trace(path, task_types, chunk_size=65536, use_cache=True):
+    cache_dir = cache_dir_for(path)
+    if not use_cache:
+        return parse_trace(path, task_types, chunk_size)
+    if cache_is_valid(path, cache_dir):
+        return read_cache(cache_dir, task_types, chunk_size)
+    return parse_and_cache(path, task_types, cache_dir, chunk_size)
@@ -0,0 +1,175 @@
+import argparse # Для разбора аргументов командной строки
+import json
+import math
+import os
+import numpy as np
+from simulator import Processor
+from sweep import DEFAULT_SCENARIO, run_sweep, scenario_seed, write_results
+
+GOLDEN_RATIO = (1 + 5 ** 0.5) / 2
+DEFAULT_LOW = 1 # Границы перебора кванта в тактах
+DEFAULT_HIGH = 64
+DEFAULT_CANDIDATES = 16 # Количество кандидатов последовательного деления
+DEFAULT_MIN_TASKS = 100 # Наименьшее количество задач в запусках первого раунда
+
+
+# Оценка кванта: выполненные задачи за секунду симулированного времени выполнения (без настройки
+# канала, она от кванта не зависит). В симуляторе ядро выполняет весь квант за один такт
+# планирования, поэтому количество тактов убывает с ростом кванта и оценка по тактам монотонна.
+# Здесь такт планирования считается отрезком из quantum тактов выполнения и switch_cost тактов
+# переключения контекста: ядро, задача которого закончилась раньше конца кванта, простаивает
+# до конца отрезка. Малые кванты проигрывают на переключениях, большие - на простое, поэтому
+# у оценки есть внутренний максимум. Симулятор переключения не моделирует, поэтому switch_cost
+# задается явно и от него зависит рекомендуемый квант. Запуски кэшируются по (квант, количество задач), поэтому
+# повторная оценка кандидата не запускает симуляцию; все кандидаты одного раунда выполняются
+# параллельно на одинаковых нагрузках (одни и те же зерна), так что сравниваются только кванты
+class QuantumEvaluator:
+    def __init__(self, base, seeds, switch_cost, workers=None):
+        self.base = base # Сценарий запусков (параметры simulate)
+        self.seeds = seeds # Зерна генерации задач, результат усредняется по ним
+        self.workers = workers
+        self.switch_cost = switch_cost
+        self.scores = {} # (квант, количество задач) -> оценка
+        self.rows = [] # Строки результатов всех запусков
+
+    def score(self, quantum, num_tasks):
+        return self.scores[(quantum, num_tasks)]
+
+    # Оценивает кванты quanta на нагрузке из num_tasks задач и возвращает словарь квант -> оценка
+    def evaluate(self, quanta, num_tasks):
+        missing = [quantum for quantum in dict.fromkeys(quanta) if (quantum, num_tasks) not in self.scores]
+        scenarios = [dict(self.base, time_quantum=quantum, num_tasks=num_tasks, seed=seed)
+                     for quantum in missing for seed in self.seeds]
+        if scenarios:
+            rows = run_sweep(scenarios, workers=self.workers)
+            for row in rows:
+                row['simulated_seconds'] = row['cycles'] * (row['time_quantum'] + self.switch_cost) / Processor.clock_speed
+                row['tasks_per_second'] = row['completed_total'] / row['simulated_seconds'] if row['cycles'] else 0.0
+            self.rows.extend(rows)
+            for quantum in missing:
+                rates = [row['tasks_per_second'] for row in rows if row['time_quantum'] == quantum]
+                self.scores[(quantum, num_tasks)] = float(np.mean(rates))
+        return {quantum: self.score(quantum, num_tasks) for quantum in quanta}
+
+
+# Целые кванты от low до high, расположенные в геометрической прогрессии
+# (малые кванты различаются сильнее, чем большие)
+def candidate_quanta(low, high, count):
+    return np.unique(np.geomspace(low, high, count).round().astype(np.int64)).tolist()
+
+
+# Последовательное деление: все кандидаты запускаются на коротких нагрузках, в следующий раунд
+# проходит лучшая 1/eta часть, а нагрузка увеличивается в eta раз. Нагрузка первого раунда подобрана
+# так, чтобы последний раунд выполнялся на max_tasks задачах, но не меньше min_tasks задач.
+# Плохие кванты отсеиваются на коротких запусках, длинные выполняются только для лучших
+def successive_halving(evaluator, candidates, min_tasks, max_tasks, eta=2):
+    rounds_count = math.ceil(math.log(len(candidates), eta)) if len(candidates) > 1 else 0
+    num_tasks = min(max(max_tasks // eta ** rounds_count, min_tasks), max_tasks)
+    rounds = []
+    while True:
+        scores = evaluator.evaluate(candidates, num_tasks)
+        # При равенстве оценок предпочитается меньший квант
+        candidates = sorted(candidates, key=lambda quantum: (-scores[quantum], quantum))
+        rounds.append({'num_tasks': num_tasks, 'scores': scores})
+        if num_tasks >= max_tasks:
+            break
+        candidates = candidates[:max(1, math.ceil(len(candidates) / eta))]
+        num_tasks = min(num_tasks * eta, max_tasks)
+    return candidates[0], rounds
+
+
+# Поиск золотого сечения на целых квантах от low до high на нагрузке из num_tasks задач.
+# Предполагает, что оценка унимодальна по кванту: на каждом шаге отбрасывается часть отрезка
+# за худшей из двух внутренних точек, а одна из точек переходит в следующий шаг
+def golden_section(evaluator, low, high, num_tasks):
+    rounds = []
+    while high - low > 2:
+        step = (high - low) / GOLDEN_RATIO
+        left = min(max(int(round(high - step)), low + 1), high - 2)
+        right = max(int(round(low + step)), left + 1)
+        scores = evaluator.evaluate([left, right], num_tasks)
+        rounds.append({'num_tasks': num_tasks, 'scores': scores})
+        if scores[left] >= scores[right]:
+            high = right
+        else:
+            low = left
+    scores = evaluator.evaluate(list(range(low, high + 1)), num_tasks)
+    rounds.append({'num_tasks': num_tasks, 'scores': scores})
+    return max(scores, key=lambda quantum: (scores[quantum], -quantum)), rounds
+
+
+# Подбирает квант для сценария base (task_types, processors_count, num_cores, scheduler, ...):
+# method - successive_halving или golden_section, num_tasks сценария - размер самых длинных запусков.
+# Со сценарием трассы (trace) количество задач задает трасса: каждый запуск выполняет ее целиком,
+# и последовательное деление сводится к одному раунду по всем кандидатам.
+# switch_cost - стоимость переключения контекста в тактах (обязательна, см. QuantumEvaluator).
+# Возвращает рекомендуемый квант, его оценку, раунды поиска и строки всех запусков
+def tune_quantum(base, switch_cost, method='successive_halving', low=DEFAULT_LOW, high=DEFAULT_HIGH,
+                 candidates=DEFAULT_CANDIDATES, min_tasks=DEFAULT_MIN_TASKS, eta=2, seeds=1, base_seed=0, workers=None):
+    if not 1 <= low <= high:
+        raise ValueError('Quantum bounds must satisfy 1 <= low <= high')
+    if eta < 2:
+        raise ValueError('eta must be at least 2')
+    if switch_cost < 0:
+        raise ValueError('Switch cost must be non-negative')
+    base = dict(DEFAULT_SCENARIO, **(base or {}))
+    max_tasks = 0 if base.get('trace') else base['num_tasks']
+    # Зерна фиксированы: оценки кандидатов отличаются только квантом
+    seed_values = [base['seed']] if base.get('seed') is not None and seeds == 1 else \
+        [scenario_seed(base_seed if base.get('seed') is None else base['seed'], base, index) for index in range(seeds)]
+    evaluator = QuantumEvaluator(base, seed_values, switch_cost, workers)
+    if method == 'successive_halving':
+        best, rounds = successive_halving(evaluator, candidate_quanta(low, high, candidates), min_tasks, max_tasks, eta)
+        score = evaluator.score(best, rounds[-1]['num_tasks'])
+    elif method == 'golden_section':
+        best, rounds = golden_section(evaluator, low, high, max_tasks)
+        score = evaluator.score(best, max_tasks)
+    else:
+        raise ValueError(f'Unknown tuning method: {method}')
+    return {'best': best, 'tasks_per_second': score, 'switch_cost': switch_cost, 'rounds': rounds,
+            'rows': evaluator.rows, 'simulations': len(evaluator.rows)}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Подбор временного кванта Round Robin по количеству выполненных '
+                                                 'задач за секунду симулированного времени')
+    parser.add_argument('spec', nargs='?', help='JSON-файл сценария {"base": {...}} (по умолчанию - сценарий '
+                                                'sweep.py с настройками simulator.DEFAULT_CONFIG)')
+    parser.add_argument('-m', '--method', choices=('successive_halving', 'golden_section'),
+                        default='successive_halving', help='Метод поиска')
+    parser.add_argument('--low', type=int, default=DEFAULT_LOW, help='Наименьший квант в тактах')
+    parser.add_argument('--high', type=int, default=DEFAULT_HIGH, help='Наибольший квант в тактах')
+    parser.add_argument('-k', '--candidates', type=int, default=DEFAULT_CANDIDATES,
+                        help='Количество кандидатов последовательного деления')
+    parser.add_argument('--min-tasks', type=int, default=DEFAULT_MIN_TASKS,
+                        help='Наименьшее количество задач в запусках первого раунда последовательного деления')
+    parser.add_argument('-n', '--num-tasks', type=int, help='Количество задач в самых длинных запусках')
+    parser.add_argument('--eta', type=int, default=2, help='Во сколько раз сокращается число кандидатов за раунд')
+    parser.add_argument('-s', '--seeds', type=int, default=1, help='Количество нагрузок (зерен) на оценку')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(), help='Количество процессов')
+    parser.add_argument('--switch-cost', type=int, required=True,
+                        help='Стоимость переключения контекста в тактах (от нее зависит рекомендуемый квант)')
+    parser.add_argument('-c', '--workload-cache', help='Каталог кэша нагрузок')
+    parser.add_argument('-o', '--output', help='CSV-файл результатов всех запусков')
+    args = parser.parse_args()
+    base = {}
+    if args.spec:
+        with open(args.spec, encoding='utf-8') as file:
+            base = json.load(file).get('base', {})
+    if args.num_tasks:
+        base['num_tasks'] = args.num_tasks
+    if args.workload_cache:
+        base['workload_cache'] = args.workload_cache
+    result = tune_quantum(base, args.switch_cost, args.method, args.low, args.high, args.candidates, args.min_tasks,
+                          args.eta, args.seeds, workers=args.workers)
+    for number, tuning_round in enumerate(result['rounds'], 1):
+        scores = ', '.join(f'{quantum}: {score:.0f}' for quantum, score in
+                           sorted(tuning_round['scores'].items(), key=lambda item: -item[1]))
+        workload = f"{tuning_round['num_tasks']} tasks" if tuning_round['num_tasks'] else 'trace'
+        print(f"Round {number} ({workload}): {scores}")
+    print(f"Recommended time quantum: {result['best']} cycles for a context switch cost of "
+          f"{result['switch_cost']} cycles ({result['tasks_per_second']:.0f} completed tasks per simulated second, "
+          f"{result['simulations']} simulations)")
+    if args.output:
+        write_results(result['rows'], args.output)
+        print(f'Runs written to {args.output}')
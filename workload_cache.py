@@ -0,0 +1,88 @@
+import hashlib # Для ключа нагрузки по содержимому параметров генерации
+import json
+import os
+import numpy as np
+from task_table import TaskTable
+
+WORKLOAD_CACHE_VERSION = 1 # Версия формата и алгоритма генерации, входит в ключ нагрузки
+# Столбцы файла нагрузки; имя, TTL и остаток операций восстанавливаются по конфигурации типов задач
+WORKLOAD_DTYPE = np.dtype([('type', np.int8), ('ticks_to_complete', np.int32), ('size', np.int32)])
+
+
+# Ключ нагрузки: SHA-256 канонического JSON параметров генерации (настройки типов задач в порядке
+# конфигурации, количество задач, зерно). chunk_size - размер частей потоковой генерации: части
+# генерируются подряд из одного генератора, поэтому задачи отличаются от генерации всей таблицей
+# (chunk_size=None)
+def workload_key(config, num_tasks, seed, chunk_size=None):
+    material = {
+        'version': WORKLOAD_CACHE_VERSION,
+        'task_types': [[task_type, {name: list(value) if isinstance(value, (list, tuple)) else value
+                                    for name, value in params.items()}] for task_type, params in config.items()],
+        'num_tasks': int(num_tasks),
+        'seed': int(seed),
+        'chunk_size': chunk_size,
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+# Таблица задач из записей файла нагрузки; first_name - имя первой задачи
+def records_to_table(config, records, first_name=0):
+    table = TaskTable(config.keys(), len(records))
+    table.type[:] = records['type']
+    table.ticks_to_complete[:] = records['ticks_to_complete']
+    table.size[:] = records['size']
+    table.remaining_operations[:] = table.ticks_to_complete
+    ttl = np.array([config[task_type]['ttl'] for task_type in table.task_types])
+    table.ttl[:] = ttl[table.type]
+    table.name += first_name
+    return table
+
+
+# Кэш сгенерированных нагрузок в каталоге directory. Нагрузка хранится одним файлом <ключ>.npy
+# со структурированным массивом WORKLOAD_DTYPE (9 байт на задачу), который читается через
+# отображение в память. Файл записывается под временным именем и переименовывается после
+# записи всех задач, поэтому прерванная генерация не оставляет неполных нагрузок
+class WorkloadCache:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, key):
+        return os.path.join(self.directory, f'{key}.npy')
+
+    # Записи нагрузки (только для чтения) или None, если нагрузки нет в кэше
+    def load(self, config, num_tasks, seed, chunk_size=None):
+        path = self.path(workload_key(config, num_tasks, seed, chunk_size))
+        if not os.path.exists(path):
+            return None
+        records = np.load(path, mmap_mode='r')
+        if records.dtype != WORKLOAD_DTYPE or len(records) != num_tasks:
+            return None
+        return records
+
+    # Запись новой нагрузки по частям (см. WorkloadWriter)
+    def writer(self, config, num_tasks, seed, chunk_size=None):
+        os.makedirs(self.directory, exist_ok=True)
+        return WorkloadWriter(self.path(workload_key(config, num_tasks, seed, chunk_size)), num_tasks)
+
+
+# Запись нагрузки: таблицы задач добавляются по порядку, commit переименовывает файл в конечное имя.
+# Временное имя содержит номер процесса: параллельные запуски не пишут в один файл
+class WorkloadWriter:
+    def __init__(self, path, num_tasks):
+        self.path = path
+        self.part_path = f'{path}.{os.getpid()}.part'
+        self.records = np.lib.format.open_memmap(self.part_path, mode='w+', dtype=WORKLOAD_DTYPE,
+                                                 shape=(num_tasks,))
+        self.count = 0
+
+    def write(self, table):
+        records = self.records[self.count:self.count + len(table)]
+        records['type'] = table.type
+        records['ticks_to_complete'] = table.ticks_to_complete
+        records['size'] = table.size
+        self.count += len(table)
+
+    def commit(self):
+        self.records.flush()
+        self.records = None
+        os.replace(self.part_path, self.path)